@@ -0,0 +1,138 @@
+"""
+All-pairs shortest paths returning dense matrices instead of nested lists of tuples.
+
+Both functions return (dist, prev) as n x n NumPy arrays, or None if the graph has a negative cycle:
+    dist[i][j] - length of the shortest path from i to j, inf if j is unreachable from i
+    prev[i][j] - predecessor of j on that path, -1 if j == i or j is unreachable
+"""
+
+import csr_graph
+import numpy as np
+import os
+import path_finding
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+# Johnson's algorithm with the per-source Dijkstra runs spread over a process pool. The reweighed CSR arrays and the
+# output matrices live in shared memory: workers attach to them by name, so neither the graph nor the results are
+# ever pickled between processes.
+def johnson_all_pairs_parallel(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph,
+                               max_workers: int = None, chunk_size: int = None) -> None | tuple[np.ndarray, np.ndarray]:
+    graph = csr_graph.as_csr(adj_list)
+    n = len(graph)
+    reweighing = path_finding.johnson_reweigh(graph)
+    if reweighing is None:
+        return None
+    potentials, reweighed = reweighing
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, n // (4 * max_workers))
+
+    inputs = {
+        "offsets": np.frombuffer(reweighed.offsets, dtype=np.int32),
+        "targets": np.frombuffer(reweighed.targets, dtype=np.int32),
+        "weights": np.frombuffer(reweighed.weights, dtype=np.float64),
+        "potentials": np.frombuffer(potentials, dtype=np.float64),
+    }
+    outputs = {"dist": ((n, n), np.float64), "prev": ((n, n), np.int32)}
+
+    blocks = []
+    try:
+        specs = {}
+        for name, values in inputs.items():
+            shm = _create_block(values.nbytes)
+            blocks.append(shm)
+            np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+            specs[name] = (shm.name, values.shape, values.dtype.str)
+        for name, (shape, dtype) in outputs.items():
+            shm = _create_block(int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            blocks.append(shm)
+            specs[name] = (shm.name, shape, np.dtype(dtype).str)
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_worker, initargs=(specs,)) as pool:
+            for future in [pool.submit(_johnson_rows, i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]:
+                future.result()
+
+        dist = _view(blocks[-2], *specs["dist"][1:]).copy()
+        prev = _view(blocks[-1], *specs["prev"][1:]).copy()
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    return dist, prev
+
+
+# Floyd-Warshall vectorised with NumPy: for each k, the rows are relaxed against row k in blocks of block_size rows so
+# that the temporary candidate matrix stays at block_size x n.
+def floyd_warshall_dense(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, block_size: int = 256) \
+        -> None | tuple[np.ndarray, np.ndarray]:
+    graph = csr_graph.as_csr(adj_list)
+    n = len(graph)
+    sources = np.frombuffer(graph.edge_sources(), dtype=np.int32)
+    targets = np.frombuffer(graph.targets, dtype=np.int32)
+    weights = np.frombuffer(graph.weights, dtype=np.float64)
+
+    d = np.full((n, n), np.inf)
+    np.fill_diagonal(d, 0.0)
+    np.minimum.at(d, (sources, targets), weights)  # keep the cheapest of any parallel edges
+    prev = np.where(np.isfinite(d), np.arange(n, dtype=np.int32)[:, None], -1).astype(np.int32)
+    np.fill_diagonal(prev, -1)
+
+    for k in range(n):
+        d_k = d[k].copy()
+        prev_k = prev[k].copy()
+        for start in range(0, n, block_size):
+            d_block = d[start:start + block_size]
+            candidate = d_block[:, k, None] + d_k
+            improved = candidate < d_block
+            d_block[improved] = candidate[improved]
+            prev[start:start + block_size][improved] = np.broadcast_to(prev_k, improved.shape)[improved]
+
+        if d[k, k] < 0:
+            return None
+
+    if np.any(np.diagonal(d) < 0):
+        return None
+
+    return d, prev
+
+
+def _create_block(size: int) -> shared_memory.SharedMemory:
+    return shared_memory.SharedMemory(create=True, size=max(size, 1))  # zero-sized segments are not allowed
+
+
+def _view(shm: shared_memory.SharedMemory, shape: tuple, dtype: str) -> np.ndarray:
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+_worker_blocks = {}
+_worker_state = {}
+
+
+def _attach_worker(specs: dict):
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_blocks[name] = shm
+        _worker_state[name] = _view(shm, shape, dtype)
+
+    offsets = memoryview(_worker_blocks["offsets"].buf)[:_worker_state["offsets"].nbytes].cast('i')
+    targets = memoryview(_worker_blocks["targets"].buf)[:_worker_state["targets"].nbytes].cast('i')
+    weights = memoryview(_worker_blocks["weights"].buf)[:_worker_state["weights"].nbytes].cast('d')
+    _worker_state["engine"] = path_finding.ShortestPathEngine(csr_graph.CSRGraph(offsets, targets, weights))
+
+
+def _johnson_rows(start: int, stop: int):
+    engine = _worker_state["engine"]
+    potentials = _worker_state["potentials"]
+    dist_out = _worker_state["dist"]
+    prev_out = _worker_state["prev"]
+
+    for source in range(start, stop):
+        dist, prev = engine.single_source(source)
+        row = np.frombuffer(dist, dtype=np.float64)
+        dist_out[source] = row + potentials - potentials[source]
+        prev_out[source] = np.frombuffer(prev, dtype=np.int32)
@@ -0,0 +1,46 @@
+"""
+Benchmark - AhoCorasick single-pass search against one string_search (KMP) pass per pattern, for a growing number of
+patterns over the same text. The per-pattern cost grows linearly with the pattern count; the automaton's does not.
+Usage: python bench_aho_corasick.py [text_kb] [max_patterns]
+"""
+
+import random
+import sys
+import time
+
+import string_search
+import string_trie
+
+
+def _words(count: int, rng: random.Random) -> list[str]:
+    return list({"".join(rng.choice("abcdefghij") for _ in range(rng.randint(4, 8))) for _ in range(count)})
+
+
+def main(text_kb: int = 64, max_patterns: int = 1000):
+    rng = random.Random(0)
+    text = "".join(rng.choice("abcdefghij ") for _ in range(text_kb * 1024))
+
+    num_patterns = 10
+    while num_patterns <= max_patterns:
+        patterns = _words(num_patterns, rng)
+
+        start = time.perf_counter()
+        automaton = string_trie.AhoCorasick(patterns)
+        automaton.compile()
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        result = sorted(automaton.search(text))
+        ac_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = sorted((i, p) for p in patterns for i in string_search.string_search(text, p))
+        kmp_time = time.perf_counter() - start
+        assert result == expected
+
+        print(f"patterns={len(patterns):6d}  aho-corasick {ac_time:7.3f} s (+{build:.3f} s build)"
+              f"  kmp per pattern {kmp_time:8.3f} s  {len(result)} matches")
+        num_patterns *= 10
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
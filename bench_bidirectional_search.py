@@ -0,0 +1,100 @@
+"""
+Benchmark - unidirectional vs bidirectional Dijkstra and A* on a grid graph and a random geometric graph, reporting
+the average query time and number of settled nodes per query.
+Usage: python bench_bidirectional_search.py [grid_side] [geometric_nodes] [queries]
+"""
+
+import math
+import random
+import sys
+import time
+from typing import Callable
+
+import csr_graph
+import path_finding
+
+
+# side x side 4-neighbour grid with weights in [1, 2); Manhattan distance is an admissible heuristic
+def _grid_graph(side: int, seed: int = 0) -> tuple[csr_graph.CSRGraph, list[tuple[float, float]]]:
+    rng = random.Random(seed)
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c
+            if c + 1 < side:
+                w = rng.uniform(1.0, 2.0)
+                edges += [(u, u + 1, w), (u + 1, u, w)]
+            if r + 1 < side:
+                w = rng.uniform(1.0, 2.0)
+                edges += [(u, u + side, w), (u + side, u, w)]
+    coords = [(float(r), float(c)) for r in range(side) for c in range(side)]
+    return csr_graph.CSRGraph.from_edges(side * side, edges), coords
+
+
+# n points in the unit square joined when closer than radius, weighted by Euclidean distance
+def _geometric_graph(n: int, seed: int = 0) -> tuple[csr_graph.CSRGraph, list[tuple[float, float]]]:
+    rng = random.Random(seed)
+    coords = [(rng.random(), rng.random()) for _ in range(n)]
+    radius = math.sqrt(8.0 / (math.pi * n))  # about 8 neighbours per node
+    cells = {}
+    for i, (x, y) in enumerate(coords):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+
+    edges = []
+    for i, (x, y) in enumerate(coords):
+        cx, cy = int(x / radius), int(y / radius)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in cells.get((cx + dx, cy + dy), []):
+                    d = math.dist(coords[i], coords[j])
+                    if i != j and d < radius:
+                        edges.append((i, j, d))
+    return csr_graph.CSRGraph.from_edges(n, edges), coords
+
+
+def _run(name: str, graph: csr_graph.CSRGraph, coords: list, queries: list, metric: Callable):
+    print(name)
+    graph.transpose()  # built once up front, as a long-running service would
+    modes = {
+        "dijkstra": lambda s, t, st: path_finding.dijkstra_shortest_path(graph, s, t, st),
+        "bidirectional dijkstra": lambda s, t, st: path_finding.bidirectional_dijkstra(graph, s, t, st),
+        "a*": lambda s, t, st: path_finding.a_star(graph, s, t, lambda v: metric(coords[v], coords[t]), st),
+        "bidirectional a*": lambda s, t, st: path_finding.bidirectional_a_star(
+            graph, s, t, lambda v: metric(coords[v], coords[t]), lambda v: metric(coords[s], coords[v]), st),
+    }
+
+    expected = [path_finding.dijkstra_shortest_path(graph, s, t)[0] for s, t in queries]
+    for mode, func in modes.items():
+        settled = 0
+        elapsed = 0.0
+        for (s, t), dist in zip(queries, expected):
+            stats = {}
+            start = time.perf_counter()
+            result = func(s, t, stats)
+            elapsed += time.perf_counter() - start
+            settled += stats["settled"]
+            assert abs(result[0] - dist) < 1e-6
+        print(f"  {mode:<24}{elapsed / len(queries) * 1000:10.2f} ms  {settled / len(queries):12.1f} settled")
+
+
+def _manhattan(a: tuple[float, float], b: tuple[float, float]) -> float:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def main(grid_side: int = 150, geometric_nodes: int = 20_000, num_queries: int = 20):
+    rng = random.Random(1)
+
+    graph, coords = _grid_graph(grid_side)
+    queries = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for _ in range(num_queries)]
+    _run(f"grid {grid_side}x{grid_side}", graph, coords, queries, _manhattan)
+
+    graph, coords = _geometric_graph(geometric_nodes)
+    # Only query pairs in the same connected piece so every query has an answer
+    reachable = path_finding.ShortestPathEngine(graph).single_source(0)[0]
+    nodes = [v for v in range(len(graph)) if reachable[v] != float("inf")]
+    queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(num_queries)]
+    _run(f"random geometric n={geometric_nodes}", graph, coords, queries, math.dist)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
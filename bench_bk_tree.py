@@ -0,0 +1,61 @@
+"""
+Benchmark - BKTree nearest/within queries vs a brute-force edit distance scan of the corpus, reporting time per query
+and the share of distance evaluations the tree avoids.
+Usage: python bench_bk_tree.py [corpus_size] [num_queries]
+"""
+
+import random
+import sys
+import time
+
+import bk_tree
+import edit_distance
+
+
+# Words drawn as mutations of a smaller set of stems, so the corpus has the clustered structure of real records
+def _corpus(size: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    stems = ["".join(rng.choice(alphabet) for _ in range(rng.randint(6, 12))) for _ in range(max(1, size // 20))]
+    words = []
+    for _ in range(size):
+        word = list(rng.choice(stems))
+        for _ in range(rng.randint(0, 3)):
+            pos = rng.randrange(len(word))
+            word[pos] = rng.choice(alphabet)
+        words.append("".join(word))
+    return words
+
+
+def main(size: int = 20_000, num_queries: int = 50):
+    corpus = _corpus(size)
+    rng = random.Random(1)
+    queries = [rng.choice(corpus)[::-1][:3] + rng.choice(corpus)[3:] for _ in range(num_queries)]
+
+    start = time.perf_counter()
+    tree = bk_tree.BKTree(corpus)
+    print(f"corpus={size} build {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    brute = []
+    for query in queries:
+        distances = sorted((edit_distance.edit_distance_bitparallel(query, word), word) for word in corpus)
+        brute.append(distances[0][0])
+    brute_time = time.perf_counter() - start
+    print(f"brute force  {brute_time / num_queries * 1000:10.2f} ms/query  {size:10d} evaluations/query")
+
+    for name, run in (("nearest k=1", lambda q: tree.nearest(q, 1)), ("nearest k=5", lambda q: tree.nearest(q, 5)),
+                      ("within d=2", lambda q: tree.within(q, 2))):
+        tree.distance_evaluations = 0
+        start = time.perf_counter()
+        results = [run(query) for query in queries]
+        elapsed = time.perf_counter() - start
+        if name == "nearest k=1":
+            assert [result[0][0] for result in results] == brute
+        evaluations = tree.distance_evaluations / num_queries
+        print(f"{name:<12} {elapsed / num_queries * 1000:10.2f} ms/query  {evaluations:10.1f} evaluations/query"
+              f"  ({100 * (1 - evaluations / size):.1f}% avoided)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""
+Benchmark - boruvka_mst scaling at 1, 2, 4 and 8 workers on a random graph, with kruskal_mst as the reference for
+both time and total tree weight. 1 worker scans in-process; more workers add process start-up to the measured time.
+Usage: python bench_boruvka.py [num_nodes] [avg_degree]
+"""
+
+import os
+import random
+import sys
+import time
+
+import csr_graph
+import minimum_spanning_tree
+
+
+def _random_graph(n: int, degree: int, seed: int = 0) -> csr_graph.CSRGraph:
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(n * degree // 2):
+        u, v, w = rng.randrange(n), rng.randrange(n), rng.random()
+        edges += [(u, v, w), (v, u, w)]
+    return csr_graph.CSRGraph.from_edges(n, edges)
+
+
+def _weight(graph: csr_graph.CSRGraph, mst: list[tuple[int, int]]) -> float:
+    cheapest = {}
+    sources = graph.edge_sources()
+    for e in range(graph.num_edges):
+        key = (sources[e], graph.targets[e])
+        cheapest[key] = min(cheapest.get(key, float("inf")), graph.weights[e])
+    return sum(cheapest[edge] for edge in mst)
+
+
+def main(n: int = 200_000, degree: int = 8):
+    graph = _random_graph(n, degree)
+    print(f"nodes={n} edges={graph.num_edges} cpus={os.cpu_count()}")
+
+    start = time.perf_counter()
+    expected = _weight(graph, minimum_spanning_tree.kruskal_mst(graph))
+    print(f"kruskal            {time.perf_counter() - start:8.2f} s")
+
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        mst = minimum_spanning_tree.boruvka_mst(graph, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        assert abs(_weight(graph, mst) - expected) < 1e-6
+        baseline = baseline or elapsed
+        print(f"boruvka {workers} workers  {elapsed:8.2f} s  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
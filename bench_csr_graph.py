@@ -0,0 +1,73 @@
+"""
+Benchmark - text edge list parsing vs memory-mapped binary CSR loading, plus on-disk sizes and a round-trip check.
+Usage: python bench_csr_graph.py [num_nodes] [avg_out_degree]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import csr_graph
+import minimum_spanning_tree
+import path_finding
+
+
+def _random_edges(n: int, degree: int, seed: int = 0) -> list[tuple[int, int, float]]:
+    rng = random.Random(seed)
+    edges = [(i, (i + 1) % n, rng.uniform(1.0, 10.0)) for i in range(n)]  # ring keeps every query reachable
+    for _ in range(n * (degree - 1)):
+        edges.append((rng.randrange(n), rng.randrange(n), rng.uniform(1.0, 10.0)))
+    return edges
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(n: int = 200_000, degree: int = 5):
+    edges = _random_edges(n, degree)
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "graph.txt")
+        bin_path = os.path.join(tmp, "graph.csr")
+        with open(text_path, "w") as f:
+            for u, v, w in edges:
+                f.write(f"{u} {v} {w!r}\n")
+
+        text_graph, text_time = _timed(csr_graph.CSRGraph.from_file, text_path, n)
+        _, write_time = _timed(text_graph.save_binary, bin_path)
+        bin_graph, load_time = _timed(csr_graph.CSRGraph.load_binary, bin_path)
+
+        assert bytes(bin_graph.offsets) == text_graph.offsets.tobytes()
+        assert bytes(bin_graph.targets) == text_graph.targets.tobytes()
+        assert bytes(bin_graph.weights) == text_graph.weights.tobytes()
+
+        print(f"nodes={n} edges={len(edges)}")
+        print(f"text size   {os.path.getsize(text_path) / 2 ** 20:8.2f} MiB  parse {text_time * 1000:10.2f} ms")
+        print(f"binary size {os.path.getsize(bin_path) / 2 ** 20:8.2f} MiB  write {write_time * 1000:10.2f} ms"
+              f"  load {load_time * 1000:8.3f} ms")
+
+        # Queries on the mapped graph must match the parsed one
+        rng = random.Random(1)
+        for _ in range(5):
+            s, t = rng.randrange(n), rng.randrange(n)
+            expected = path_finding.dijkstra_shortest_path(text_graph, s, t)
+            actual, query_time = _timed(path_finding.dijkstra_shortest_path, bin_graph, s, t)
+            assert expected == actual
+            print(f"dijkstra {s}->{t} on mapped graph {query_time * 1000:10.2f} ms")
+
+        small = csr_graph.CSRGraph.from_edges(1000, _random_edges(1000, degree))
+        small.save_binary(bin_path)
+        assert minimum_spanning_tree.kruskal_mst(small) == \
+            minimum_spanning_tree.kruskal_mst(csr_graph.CSRGraph.load_binary(bin_path))
+        print("round trip ok")
+
+        # Release the mappings before the temporary directory is removed
+        del bin_graph
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
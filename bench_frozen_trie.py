@@ -0,0 +1,68 @@
+"""
+Benchmark - memory and lookup time of FrozenTrie against StringTrie over the same random keys, with the frozen trie
+both freshly built and loaded back from a memory-mapped file.
+Usage: python bench_frozen_trie.py [num_keys]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import string_trie
+
+
+def _keys(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return sorted({"".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(5, 15))) for _ in range(count)})
+
+
+def _measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def _string_trie(keys: list[str]) -> string_trie.StringTrie:
+    trie = string_trie.StringTrie()
+    for key in keys:
+        trie.insert(key)
+    return trie
+
+
+def main(num_keys: int = 200_000):
+    keys = _keys(num_keys)
+    rng = random.Random(1)
+    queries = [rng.choice(keys) for _ in range(50_000)] + [key[::-1] for key in keys[:50_000]]
+    key_bytes = sum(len(key) for key in keys)
+    print(f"keys={len(keys)} key bytes={key_bytes}")
+
+    trie, elapsed, size = _measure(lambda: _string_trie(keys))
+    print(f"StringTrie          build {elapsed:6.2f} s  {size / 2 ** 20:8.1f} MB")
+    frozen, elapsed, size = _measure(lambda: string_trie.FrozenTrie.build(keys))
+    print(f"FrozenTrie          build {elapsed:6.2f} s  {size / 2 ** 20:8.1f} MB  nodes={len(frozen.terminal)}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "keys.trie")
+        frozen.save(path)
+        loaded, elapsed, size = _measure(lambda: string_trie.FrozenTrie.load(path))
+        print(f"FrozenTrie (mmap)   load  {elapsed:6.2f} s  {size / 2 ** 20:8.1f} MB private"
+              f"  file {os.path.getsize(path) / 2 ** 20:.1f} MB")
+
+        expected = None
+        for name, structure in (("StringTrie", trie), ("FrozenTrie", frozen), ("FrozenTrie (mmap)", loaded)):
+            start = time.perf_counter()
+            result = [structure.find(query) for query in queries]
+            elapsed = time.perf_counter() - start
+            expected = expected if expected is not None else result
+            assert result == expected
+            print(f"{name:<19} find  {elapsed / len(queries) * 1e6:6.2f} us/query")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
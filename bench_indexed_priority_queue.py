@@ -0,0 +1,107 @@
+"""
+Benchmark - Dijkstra and Prim with the indexed decrease-key heap vs the previous heapq approach that pushes a
+duplicate entry per scanned edge and skips stale ones. Reports time, peak traced memory and peak queue length on a
+dense graph.
+Usage: python bench_indexed_priority_queue.py [num_nodes] [edge_probability]
+"""
+
+import heapq
+import random
+import sys
+import time
+import tracemalloc
+
+import csr_graph
+import minimum_spanning_tree
+import path_finding
+
+
+def _dense_graph(n: int, p: float, seed: int = 0) -> csr_graph.CSRGraph:
+    rng = random.Random(seed)
+    edges = []
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < p:
+                w = rng.uniform(1.0, 100.0)
+                edges += [(u, v, w), (v, u, w)]
+    return csr_graph.CSRGraph.from_edges(n, edges)
+
+
+# The heapq-based versions the indexed heap replaced, kept here as the baseline
+def _heapq_dijkstra(graph: csr_graph.CSRGraph, start: int, end: int, stats: dict) -> float:
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    seen = [False] * len(graph)
+    pq = [(0.0, start)]
+    peak = 1
+    while True:
+        curr_dist, curr_index = heapq.heappop(pq)
+        if seen[curr_index]:
+            continue
+        seen[curr_index] = True
+        if curr_index == end:
+            stats["peak"] = peak
+            return curr_dist
+        for e in range(offsets[curr_index], offsets[curr_index + 1]):
+            if not seen[targets[e]]:
+                heapq.heappush(pq, (weights[e] + curr_dist, targets[e]))
+        peak = max(peak, len(pq))
+
+
+def _heapq_prim(graph: csr_graph.CSRGraph, stats: dict) -> list[tuple[int, int]]:
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph)
+    pq = [(0.0, 0, 0)]
+    mst = []
+    seen = [False] * n
+    peak = 1
+    while len(mst) < n - 1:
+        _, parent, curr = heapq.heappop(pq)
+        if seen[curr]:
+            continue
+        if parent != curr:
+            mst.append((parent, curr))
+        seen[curr] = True
+        for e in range(offsets[curr], offsets[curr + 1]):
+            if not seen[targets[e]]:
+                heapq.heappush(pq, (weights[e], curr, targets[e]))
+        peak = max(peak, len(pq))
+    stats["peak"] = peak
+    return mst
+
+
+def _measure(func, *args) -> tuple[object, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _mst_weight(graph: csr_graph.CSRGraph, mst: list[tuple[int, int]]) -> float:
+    adj = graph.to_adj_list()
+    return sum(min(w for v, w in adj[a] if v == b) for a, b in mst)
+
+
+def main(n: int = 2000, p: float = 0.5):
+    graph = _dense_graph(n, p)
+    print(f"nodes={n} edges={graph.num_edges}")
+
+    stats = {}
+    expected, base_time, base_mem = _measure(_heapq_dijkstra, graph, 0, n - 1, stats)
+    print(f"dijkstra heapq   {base_time * 1000:10.2f} ms  peak {base_mem / 2 ** 10:10.1f} KiB  queue {stats['peak']}")
+    result, new_time, new_mem = _measure(path_finding.dijkstra_shortest_path, graph, 0, n - 1)
+    assert abs(result[0] - expected) < 1e-9
+    print(f"dijkstra indexed {new_time * 1000:10.2f} ms  peak {new_mem / 2 ** 10:10.1f} KiB  queue <= {n}")
+
+    stats = {}
+    expected, base_time, base_mem = _measure(_heapq_prim, graph, stats)
+    print(f"prim heapq       {base_time * 1000:10.2f} ms  peak {base_mem / 2 ** 10:10.1f} KiB  queue {stats['peak']}")
+    result, new_time, new_mem = _measure(minimum_spanning_tree.prim_mst, graph)
+    assert abs(_mst_weight(graph, result) - _mst_weight(graph, expected)) < 1e-6
+    print(f"prim indexed     {new_time * 1000:10.2f} ms  peak {new_mem / 2 ** 10:10.1f} KiB  queue <= {n}")
+
+
+if __name__ == "__main__":
+    main(*(f(arg) for f, arg in zip((int, float), sys.argv[1:])))
@@ -0,0 +1,57 @@
+"""
+Benchmark - LongestCommonExtension queries on near-duplicate text: lce() in a loop and lce_many() on the same batch,
+against comparing the two suffixes character by character.
+Usage: python bench_lce.py [size_kb] [num_pairs]
+"""
+
+import random
+import sys
+import time
+
+import longest_common_extension
+
+
+def _naive(s: bytes, i: int, j: int) -> int:
+    k = 0
+    while i + k < len(s) and j + k < len(s) and s[i + k] == s[j + k]:
+        k += 1
+    return k
+
+
+def main(size_kb: int = 64, num_pairs: int = 100_000):
+    rng = random.Random(0)
+    # Repeated blocks with a few mutations, so common extensions are long
+    block = bytes(rng.randrange(97, 101) for _ in range(4096))
+    text = bytearray(block * (size_kb // 4 + 1))[:size_kb * 1024]
+    for _ in range(len(text) // 1000):
+        text[rng.randrange(len(text))] = rng.randrange(97, 101)
+    text = bytes(text)
+    # Mostly pairs a whole number of blocks apart, as a dedup pipeline would probe them
+    pairs = []
+    for _ in range(num_pairs):
+        i = rng.randrange(len(text))
+        j = i % 4096 + 4096 * rng.randrange(len(text) // 4096) if rng.random() < 0.9 else rng.randrange(len(text))
+        pairs.append((i, min(j, len(text) - 1)))
+
+    start = time.perf_counter()
+    engine = longest_common_extension.LongestCommonExtension(text)
+    print(f"n={len(text)}  build {time.perf_counter() - start:6.2f} s")
+
+    start = time.perf_counter()
+    expected = [_naive(text, i, j) for i, j in pairs[:num_pairs // 10]]
+    naive_time = (time.perf_counter() - start) / len(expected)
+    start = time.perf_counter()
+    single = [engine.lce(i, j) for i, j in pairs]
+    single_time = (time.perf_counter() - start) / num_pairs
+    start = time.perf_counter()
+    batch = engine.lce_many(pairs)
+    batch_time = (time.perf_counter() - start) / num_pairs
+    assert single[:len(expected)] == expected and batch.tolist() == single
+
+    print(f"naive     {naive_time * 1e6:8.2f} us/pair  (mean lce {sum(expected) / len(expected):.0f})")
+    print(f"lce       {single_time * 1e6:8.2f} us/pair")
+    print(f"lce_many  {batch_time * 1e6:8.2f} us/pair")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""
+Benchmark - StreamingMatcher throughput in MB/s over chunked bytes, against bytes.find and re.finditer over the whole
+buffer. All three report overlapping matches so their results can be checked against each other.
+Usage: python bench_string_search.py [size_mb] [chunk_kb]
+"""
+
+import random
+import re
+import sys
+import time
+
+import string_search
+
+
+def _text(size: int, pattern: bytes, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    # Mostly log-like filler with the pattern (and near misses of it) sprinkled in
+    parts = []
+    total = 0
+    while total < size:
+        roll = rng.random()
+        if roll < 0.01:
+            part = pattern
+        elif roll < 0.05:
+            part = pattern[:-1] + b" "
+        else:
+            part = b"2024-01-01 INFO request handled id=%d status=200\n" % rng.randrange(10 ** 6)
+        parts.append(part)
+        total += len(part)
+    return b"".join(parts)[:size]
+
+
+def _find_all(data: bytes, pattern: bytes) -> list[int]:
+    res = []
+    pos = data.find(pattern)
+    while pos != -1:
+        res.append(pos)
+        pos = data.find(pattern, pos + 1)
+    return res
+
+
+def _streaming(data: bytes, pattern: bytes, chunk_size: int) -> list[int]:
+    matcher = string_search.StreamingMatcher(pattern)
+    view = memoryview(data)
+    res = []
+    for start in range(0, len(data), chunk_size):
+        # bytes chunks get the find() fast path; a memoryview would be scanned element by element
+        res.extend(matcher.feed(bytes(view[start:start + chunk_size])))
+    return res
+
+
+def main(size_mb: int = 32, chunk_kb: int = 64):
+    pattern = b"ERROR timeout"
+    data = _text(size_mb * 2 ** 20, pattern)
+    overlapping = re.compile(b"(?=" + re.escape(pattern) + b")")
+
+    runs = (
+        ("StreamingMatcher", lambda: _streaming(data, pattern, chunk_kb * 2 ** 10)),
+        ("bytes.find", lambda: _find_all(data, pattern)),
+        ("re.finditer", lambda: [m.start() for m in overlapping.finditer(data)]),
+    )
+    expected = None
+    for name, run in runs:
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        expected = expected if expected is not None else result
+        assert result == expected
+        print(f"{name:<18}{len(data) / 2 ** 20 / elapsed:10.1f} MB/s  {len(result)} matches")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
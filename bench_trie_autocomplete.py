@@ -0,0 +1,76 @@
+"""
+Benchmark - StringTrie autocomplete: p50/p99 latency of top_k() for short prefixes, the cost of the first results
+from iter_prefix(), and find_many()/insert_many() against per-key find()/insert() loops over the same sorted keys.
+Usage: python bench_trie_autocomplete.py [num_keys] [num_queries]
+"""
+
+import gc
+import random
+import sys
+import time
+
+import string_trie
+
+
+def _keys(count: int, seed: int = 0) -> tuple[list[str], list[float]]:
+    rng = random.Random(seed)
+    keys = sorted({"".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 12)))
+                   for _ in range(count)})
+    # Heavy-tailed popularity, as for query logs
+    return keys, [rng.paretovariate(1.2) for _ in keys]
+
+
+def _percentiles(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[min(len(samples) - 1, len(samples) * 99 // 100)] * 1e6
+    return f"p50 {p50:8.1f} us  p99 {p99:8.1f} us"
+
+
+def main(num_keys: int = 500_000, num_queries: int = 20_000):
+    keys, scores = _keys(num_keys)
+    rng = random.Random(1)
+    prefixes = [rng.choice(keys)[:rng.randint(1, 3)] for _ in range(num_queries)]
+
+    print(f"keys={len(keys)}")
+    # Each trie is built while no other one is alive, so the garbage collector sees the same heap for both
+    loop = string_trie.StringTrie()
+    start = time.perf_counter()
+    for key, score in zip(keys, scores):
+        loop.insert(key, score)
+    print(f"insert loop {time.perf_counter() - start:6.2f} s", end="")
+    # Parent pointers make the trie cyclic, so it is only freed by a collection
+    del loop
+    gc.collect()
+    trie = string_trie.StringTrie()
+    start = time.perf_counter()
+    trie.insert_many(keys, scores)
+    print(f"  insert_many {time.perf_counter() - start:6.2f} s")
+
+    for k in (10, 50):
+        samples = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            trie.top_k(prefix, k)
+            samples.append(time.perf_counter() - start)
+        print(f"top_k k={k:<3}            {_percentiles(samples)}")
+
+    samples = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        for _, _ in zip(range(10), trie.iter_prefix(prefix)):
+            pass
+        samples.append(time.perf_counter() - start)
+    print(f"iter_prefix first 10   {_percentiles(samples)}")
+
+    queries = sorted([rng.choice(keys) for _ in range(num_queries)] + [key[::-1] for key in keys[:num_queries]])
+    start = time.perf_counter()
+    expected = [trie.find(query) for query in queries]
+    find_time = time.perf_counter() - start
+    start = time.perf_counter()
+    assert trie.find_many(queries) == expected
+    print(f"find loop   {find_time:6.2f} s  find_many   {time.perf_counter() - start:6.2f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,120 @@
+"""
+BKTree - metric tree over a corpus for nearest-neighbour and range queries under edit distance (or any other integer
+metric). Every child of a node hangs off the edge labelled with its distance to that node, so by the triangle
+inequality a query at distance dist from a node only needs to visit the children whose label lies within
+[dist - radius, dist + radius]; all other subtrees are skipped without computing a single distance.
+
+distance_evaluations counts the distance computations made by queries in this process, for comparison against the
+len(tree) evaluations a brute-force scan needs per query. For query_many() with a process pool, the distance function
+must be picklable (i.e. defined at module level).
+"""
+
+import edit_distance
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Sequence
+
+
+class BKTree:
+    def __init__(self, corpus: Iterable[Sequence] = (),
+                 distance: Callable[[Sequence, Sequence], int] = edit_distance.edit_distance_bitparallel):
+        self._distance = distance
+        self._items = []
+        self._children = []  # per node: distance label -> child node index
+        self.distance_evaluations = 0
+        for item in corpus:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: Sequence):
+        index = len(self._items)
+        self._items.append(item)
+        self._children.append({})
+        if index == 0:
+            return
+
+        node = 0
+        while True:
+            dist = self._distance(item, self._items[node])
+            child = self._children[node].get(dist)
+            if child is None:
+                self._children[node][dist] = index
+                return
+            node = child
+
+    # All corpus items within max_distance of query, as (distance, item) sorted by distance
+    def within(self, query: Sequence, max_distance: int) -> list[tuple[int, Sequence]]:
+        if not self._items:
+            return []
+
+        results = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            dist = self._distance(query, self._items[node])
+            self.distance_evaluations += 1
+            if dist <= max_distance:
+                results.append((dist, node))
+
+            for label, child in self._children[node].items():
+                if dist - max_distance <= label <= dist + max_distance:
+                    stack.append(child)
+
+        results.sort()
+        return [(dist, self._items[node]) for dist, node in results]
+
+    # The k corpus items closest to query, as (distance, item) sorted by distance. The search radius shrinks to the
+    # current k-th best distance as results come in, and children closer in label to the query are visited first.
+    def nearest(self, query: Sequence, k: int = 1) -> list[tuple[int, Sequence]]:
+        if not self._items or k <= 0:
+            return []
+
+        best = []  # max-heap of (-distance, -node) holding the k best so far
+        stack = [(0, 0)]  # (node, lower bound on the distance from query to anything in its subtree)
+        while stack:
+            node, bound = stack.pop()
+            # The radius may have shrunk since the node was pushed
+            if len(best) == k and bound > -best[0][0]:
+                continue
+            dist = self._distance(query, self._items[node])
+            self.distance_evaluations += 1
+            if len(best) < k:
+                heapq.heappush(best, (-dist, -node))
+            elif dist < -best[0][0]:
+                heapq.heapreplace(best, (-dist, -node))
+
+            radius = -best[0][0] if len(best) == k else float("inf")
+            candidates = [(abs(label - dist), child) for label, child in self._children[node].items()
+                          if dist - radius <= label <= dist + radius]
+            # Pushed furthest-first so the most promising child is popped next
+            candidates.sort(reverse=True)
+            stack.extend((child, gap) for gap, child in candidates)
+
+        return [(dist, self._items[node]) for dist, node in sorted((-d, -n) for d, n in best)]
+
+    # nearest() for many queries, spread over a process pool; each worker receives the tree once
+    def query_many(self, queries: Sequence[Sequence], k: int = 1, max_workers: int = None) \
+            -> list[list[tuple[int, Sequence]]]:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers == 1 or len(queries) < 2:
+            return [self.nearest(query, k) for query in queries]
+
+        chunk_size = max(1, len(queries) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,)) as pool:
+            return list(pool.map(_nearest_worker, queries, [k] * len(queries), chunksize=chunk_size))
+
+
+_worker_tree = None
+
+
+def _init_worker(tree: BKTree):
+    global _worker_tree
+    _worker_tree = tree
+
+
+def _nearest_worker(query: Sequence, k: int) -> list[tuple[int, Sequence]]:
+    return _worker_tree.nearest(query, k)
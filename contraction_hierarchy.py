@@ -0,0 +1,297 @@
+"""
+ContractionHierarchy - preprocesses a static graph so that repeated shortest-path queries only explore a tiny part
+of it. Nodes are contracted one at a time in order of importance (edge difference plus number of contracted
+neighbours, updated lazily); contracting v adds a shortcut u -> x of weight w(u, v) + w(v, x) for every pair of
+neighbours whose shortest path goes through v, which a bounded witness search fails to disprove.
+
+Afterwards each edge (original or shortcut) is stored once, at its lower-ranked endpoint:
+    up    - u -> x with rank[u] < rank[x], searched forward from the start
+    down  - u -> x with rank[u] > rank[x], stored reversed at x and searched backward from the end
+so a query is a bidirectional search that only ever moves to higher-ranked nodes. The middle node of every shortcut
+(-1 for original edges) is kept so that paths can be unpacked to the same node sequence Dijkstra would report.
+
+save()/load() use the same layout idea as CSRGraph.save_binary(): a header followed by the raw arrays, mapped with
+mmap on load so worker processes share one copy.
+"""
+
+import csr_graph
+import heapq
+import mmap
+import struct
+import sys
+from array import array
+
+_MAGIC = b"CHGR"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBB2xqqq")  # magic, version, little endian flag, pad, n, up edges, down edges
+
+
+class ContractionHierarchy:
+    def __init__(self, rank: array, up: csr_graph.CSRGraph, up_middle: array, down: csr_graph.CSRGraph,
+                 down_middle: array):
+        self.rank = rank
+        self.up = up
+        self.up_middle = up_middle
+        self.down = down
+        self.down_middle = down_middle
+
+    # witness_settle_limit bounds each witness search; a lower limit builds faster but may add unnecessary shortcuts
+    @classmethod
+    def build(cls, adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, witness_settle_limit: int = 50) \
+            -> 'ContractionHierarchy':
+        graph = csr_graph.as_csr(adj_list)
+        n = len(graph)
+        offsets = graph.offsets
+        targets = graph.targets
+        weights = graph.weights
+
+        # Mutable adjacency of the not yet contracted part of the graph: neighbour -> (weight, middle node)
+        out_edges = [{} for _ in range(n)]
+        in_edges = [{} for _ in range(n)]
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                x = targets[e]
+                if x != u and (x not in out_edges[u] or weights[e] < out_edges[u][x][0]):
+                    out_edges[u][x] = (weights[e], -1)
+                    in_edges[x][u] = (weights[e], -1)
+
+        contracted_neighbours = [0] * n
+        rank = array('i', [0]) * n
+        up_edges = []  # (u, x, weight, middle), stored at u
+        down_edges = []  # (x, u, weight, middle) for an edge u -> x, stored at x
+
+        def priority(v: int, shortcuts: list) -> int:
+            return len(shortcuts) - len(in_edges[v]) - len(out_edges[v]) + contracted_neighbours[v]
+
+        pq = [(priority(v, _find_shortcuts(v, out_edges, in_edges, witness_settle_limit)), v) for v in range(n)]
+        heapq.heapify(pq)
+        next_rank = 0
+        while pq:
+            _, v = heapq.heappop(pq)
+            # Lazy update: the stored priority may be stale, so recompute it and requeue if v is no longer the minimum
+            shortcuts = _find_shortcuts(v, out_edges, in_edges, witness_settle_limit)
+            current = priority(v, shortcuts)
+            if pq and current > pq[0][0]:
+                heapq.heappush(pq, (current, v))
+                continue
+
+            for u, x, w in shortcuts:
+                if x not in out_edges[u] or w < out_edges[u][x][0]:
+                    out_edges[u][x] = (w, v)
+                    in_edges[x][u] = (w, v)
+
+            rank[v] = next_rank
+            next_rank += 1
+            # Every remaining neighbour outranks v, so v's edges are final: outgoing ones go up, incoming ones go down
+            for x, (w, mid) in out_edges[v].items():
+                up_edges.append((v, x, w, mid))
+                del in_edges[x][v]
+                contracted_neighbours[x] += 1
+            for u, (w, mid) in in_edges[v].items():
+                down_edges.append((v, u, w, mid))
+                del out_edges[u][v]
+                contracted_neighbours[u] += 1
+            out_edges[v] = {}
+            in_edges[v] = {}
+
+        up, up_middle = _to_csr(n, up_edges)
+        down, down_middle = _to_csr(n, down_edges)
+        return cls(rank, up, up_middle, down, down_middle)
+
+    def __len__(self) -> int:
+        return len(self.rank)
+
+    # Same (distance, path) as dijkstra_shortest_path; (inf, []) if end is unreachable
+    def query(self, start: int, end: int) -> tuple[float, list[int]]:
+        if start == end:
+            return 0.0, [start]
+
+        graphs = (self.up, self.down)
+        dist = ({start: 0.0}, {end: 0.0})
+        prev = ({start: -1}, {end: -1})
+        settled = (set(), set())
+        pqs = ([(0.0, start)], [(0.0, end)])
+        best = float("inf")
+        meet = -1
+
+        while pqs[0] or pqs[1]:
+            # Alternate directions; a direction is done once its smallest key cannot improve the best meeting point
+            for side in (0, 1):
+                pq = pqs[side]
+                if not pq:
+                    continue
+                if pq[0][0] >= best:
+                    pq.clear()
+                    continue
+
+                curr_dist, curr_index = heapq.heappop(pq)
+                if curr_index in settled[side]:
+                    continue
+                settled[side].add(curr_index)
+
+                other = dist[1 - side].get(curr_index)
+                if other is not None and curr_dist + other < best:
+                    best = curr_dist + other
+                    meet = curr_index
+
+                side_dist = dist[side]
+                side_prev = prev[side]
+                offsets = graphs[side].offsets
+                targets = graphs[side].targets
+                weights = graphs[side].weights
+                for e in range(offsets[curr_index], offsets[curr_index + 1]):
+                    n_node = targets[e]
+                    n_dist = curr_dist + weights[e]
+                    if n_dist < side_dist.get(n_node, best):
+                        side_dist[n_node] = n_dist
+                        side_prev[n_node] = curr_index
+                        heapq.heappush(pq, (n_dist, n_node))
+
+        if meet == -1:
+            return float("inf"), []
+
+        hierarchy_path = []
+        pos = meet
+        while pos != -1:
+            hierarchy_path.append(pos)
+            pos = prev[0][pos]
+        hierarchy_path.reverse()
+        pos = prev[1][meet]
+        while pos != -1:
+            hierarchy_path.append(pos)
+            pos = prev[1][pos]
+
+        path = [start]
+        for u, x in zip(hierarchy_path, hierarchy_path[1:]):
+            self._unpack(u, x, path)
+        return best, path
+
+    # Appends the original nodes of edge u -> x, excluding u, to path
+    def _unpack(self, u: int, x: int, path: list[int]):
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            mid = self._middle(a, b)
+            if mid == -1:
+                path.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+
+    def _middle(self, u: int, x: int) -> int:
+        # Each contracted node keeps exactly one edge per neighbour and direction, so the first match is the edge
+        if self.rank[u] < self.rank[x]:
+            graph, middle, at, target = self.up, self.up_middle, u, x
+        else:
+            graph, middle, at, target = self.down, self.down_middle, x, u
+        for e in range(graph.offsets[at], graph.offsets[at + 1]):
+            if graph.targets[e] == target:
+                return middle[e]
+        raise KeyError("Edge not part of the hierarchy!")
+
+    def save(self, path: str):
+        n = len(self.rank)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == "little", n, self.up.num_edges,
+                                 self.down.num_edges))
+            for values in (self.rank, self.up.offsets, self.up.targets, self.up_middle, self.down.offsets,
+                           self.down.targets, self.down_middle):
+                f.write(values)
+            f.write(b"\0" * (-f.tell() % 8))
+            f.write(self.up.weights)
+            f.write(self.down.weights)
+
+    @classmethod
+    def load(cls, path: str) -> 'ContractionHierarchy':
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mm) < _HEADER.size:
+            raise ValueError("File too small to be a contraction hierarchy!")
+        magic, version, little_endian, n, m_up, m_down = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("File is not a contraction hierarchy of a supported version!")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError("Contraction hierarchy file was written with a different byte order!")
+
+        buf = memoryview(mm)
+        pos = _HEADER.size
+        views = []
+        for count, typecode, size in ((n, 'i', 4), (n + 1, 'i', 4), (m_up, 'i', 4), (m_up, 'i', 4),
+                                      (n + 1, 'i', 4), (m_down, 'i', 4), (m_down, 'i', 4), (-1, None, 0),
+                                      (m_up, 'd', 8), (m_down, 'd', 8)):
+            if typecode is None:
+                pos += -pos % 8
+                continue
+            if len(mm) < pos + count * size:
+                raise ValueError("Contraction hierarchy file is truncated!")
+            views.append(buf[pos:pos + count * size].cast(typecode))
+            pos += count * size
+
+        rank, up_offsets, up_targets, up_middle, down_offsets, down_targets, down_middle, up_weights, down_weights \
+            = views
+        return cls(rank, csr_graph.CSRGraph(up_offsets, up_targets, up_weights), up_middle,
+                   csr_graph.CSRGraph(down_offsets, down_targets, down_weights), down_middle)
+
+
+# Shortcuts (u, x, weight) needed if v were contracted now: one per in/out neighbour pair whose path through v is
+# not matched by a witness path avoiding v
+def _find_shortcuts(v: int, out_edges: list[dict], in_edges: list[dict], settle_limit: int) \
+        -> list[tuple[int, int, float]]:
+    shortcuts = []
+    if not in_edges[v] or not out_edges[v]:
+        return shortcuts
+
+    max_out = max(w for w, _ in out_edges[v].values())
+    for u, (w_in, _) in in_edges[v].items():
+        witness = _witness_search(u, v, w_in + max_out, out_edges[v].keys(), out_edges, settle_limit)
+        for x, (w_out, _) in out_edges[v].items():
+            if x == u:
+                continue
+            if witness.get(x, float("inf")) > w_in + w_out:
+                shortcuts.append((u, x, w_in + w_out))
+    return shortcuts
+
+
+# Bounded Dijkstra from u in the remaining graph that never passes through v; stops early once every target is settled
+def _witness_search(u: int, v: int, max_dist: float, targets, out_edges: list[dict], settle_limit: int) -> dict:
+    dist = {u: 0.0}
+    settled = set()
+    remaining = len(targets)
+    pq = [(0.0, u)]
+    while pq and len(settled) < settle_limit:
+        curr_dist, curr_index = heapq.heappop(pq)
+        if curr_dist > max_dist:
+            break
+        if curr_index in settled:
+            continue
+        settled.add(curr_index)
+        if curr_index in targets:
+            remaining -= 1
+            if remaining == 0:
+                break
+
+        for n_node, (w, _) in out_edges[curr_index].items():
+            if n_node == v:
+                continue
+            n_dist = curr_dist + w
+            if n_dist < dist.get(n_node, float("inf")):
+                dist[n_node] = n_dist
+                heapq.heappush(pq, (n_dist, n_node))
+    return dist
+
+
+def _to_csr(n: int, edges: list[tuple[int, int, float, int]]) -> tuple[csr_graph.CSRGraph, array]:
+    edges.sort(key=lambda edge: edge[0])
+    offsets = array('i', [0]) * (n + 1)
+    targets = array('i')
+    weights = array('d')
+    middle = array('i')
+    for at, target, w, mid in edges:
+        offsets[at + 1] += 1
+        targets.append(target)
+        weights.append(w)
+        middle.append(mid)
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    return csr_graph.CSRGraph(offsets, targets, weights), middle
@@ -0,0 +1,261 @@
+"""
+CSRGraph - compressed sparse row representation of a directed graph with nodes 0..n-1. The outgoing edges of node u
+are stored at positions offsets[u] to offsets[u+1] (exclusive) of the flat targets/weights arrays, so the whole graph
+costs 4 bytes per node plus 12 bytes per edge instead of a list and a tuple object per edge.
+
+Unweighted graphs (e.g. for SCC) keep an empty weights array; weight() then reports 1.0 for every edge.
+
+Binary file layout (native byte order, recorded in the header and checked on load):
+    header   - magic b"CSRG", version, byte order, weighted flag, padding, n, m   (see _HEADER)
+    offsets  - (n + 1) int32
+    targets  - m int32
+    padding  - up to 8-byte alignment
+    weights  - m float64 (omitted for unweighted graphs)
+load_binary() maps the file and exposes the three arrays as memoryviews over the mapping, so opening a graph is O(1)
+and every process mapping the same file shares the same physical pages.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from itertools import repeat
+from typing import Iterator
+
+_MAGIC = b"CSRG"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBBxqq")  # magic, version, little endian flag, weighted flag, pad, n, m
+
+
+class CSRGraph:
+    def __init__(self, offsets: array, targets: array, weights: array = None):
+        if weights is None:
+            weights = array('d')
+        if len(offsets) == 0 or offsets[-1] != len(targets):
+            raise ValueError("Offsets do not describe the targets array!")
+        if len(weights) != 0 and len(weights) != len(targets):
+            raise ValueError("Weights and targets arrays differ in length!")
+
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._sources = None
+        self._transpose = None
+        self._unit_weighted = None
+
+    # Counting sort of the edges by source; keeps the relative order of the edges of each source node
+    @classmethod
+    def from_edges(cls, n: int, edges, weighted: bool = True) -> 'CSRGraph':
+        sources = array('i')
+        targets = array('i')
+        weights = array('d')
+        for edge in edges:
+            sources.append(edge[0])
+            targets.append(edge[1])
+            if weighted:
+                weights.append(edge[2] if len(edge) > 2 else 1.0)
+
+        return cls._from_parallel_arrays(n, sources, targets, weights)
+
+    @classmethod
+    def from_adj_list(cls, adj_list: list, weighted: bool = True) -> 'CSRGraph':
+        n = len(adj_list)
+        offsets = array('i', [0]) * (n + 1)
+        targets = array('i')
+        weights = array('d')
+
+        for i, l in enumerate(adj_list):
+            if weighted:
+                for item in l:
+                    targets.append(item[0])
+                    weights.append(item[1])
+            else:
+                # Accept both plain neighbour lists and (neighbour, weight) lists
+                for item in l:
+                    targets.append(item if isinstance(item, int) else item[0])
+            offsets[i + 1] = len(targets)
+
+        return cls(offsets, targets, weights)
+
+    # Text edge list, one "u v [w]" per line; blank lines and lines starting with '#' are skipped.
+    # n defaults to one more than the largest node id seen.
+    @classmethod
+    def from_file(cls, path: str, n: int = None, weighted: bool = True) -> 'CSRGraph':
+        sources = array('i')
+        targets = array('i')
+        weights = array('d')
+        max_node = -1
+        for u, v, w in read_edge_file(path):
+            sources.append(u)
+            targets.append(v)
+            if weighted:
+                weights.append(w)
+            max_node = max(max_node, u, v)
+
+        return cls._from_parallel_arrays(max_node + 1 if n is None else n, sources, targets, weights)
+
+    @classmethod
+    def _from_parallel_arrays(cls, n: int, sources: array, targets: array, weights: array) -> 'CSRGraph':
+        m = len(sources)
+        offsets = array('i', [0]) * (n + 1)
+        for u in sources:
+            offsets[u + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        insert_pos = offsets[:-1]
+        sorted_targets = array('i', [0]) * m
+        sorted_weights = array('d', [0.0]) * m if weights else array('d')
+        for e in range(m):
+            u = sources[e]
+            pos = insert_pos[u]
+            sorted_targets[pos] = targets[e]
+            if weights:
+                sorted_weights[pos] = weights[e]
+            insert_pos[u] = pos + 1
+
+        return cls(offsets, sorted_targets, sorted_weights)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def weighted(self) -> bool:
+        return len(self.weights) != 0 or len(self.targets) == 0
+
+    def weight(self, e: int) -> float:
+        return self.weights[e] if self.weights else 1.0
+
+    def neighbours(self, u: int):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    # Source node of every edge, built once on demand (needed by edge-centric algorithms such as Kruskal)
+    def edge_sources(self) -> array:
+        if self._sources is None:
+            sources = array('i', [0]) * len(self.targets)
+            offsets = self.offsets
+            for u in range(len(offsets) - 1):
+                for e in range(offsets[u], offsets[u + 1]):
+                    sources[e] = u
+            self._sources = sources
+        return self._sources
+
+    # Same graph with every edge reversed; cached since the graph is treated as immutable
+    def transpose(self) -> 'CSRGraph':
+        if self._transpose is None:
+            self._transpose = CSRGraph._from_parallel_arrays(self.num_nodes, self.targets, self.edge_sources(),
+                                                             self.weights)
+            self._transpose._transpose = self
+        return self._transpose
+
+    # Same structure with a new weights array; offsets and targets are shared rather than copied
+    def with_weights(self, weights: array) -> 'CSRGraph':
+        return CSRGraph(self.offsets, self.targets, weights)
+
+    # The graph with every weight 1.0, built once and kept, so its transpose is cached across calls as well
+    def with_unit_weights(self) -> 'CSRGraph':
+        if self.weighted:
+            return self
+        if self._unit_weighted is None:
+            self._unit_weighted = self.with_weights(array('d', [1.0]) * self.num_edges)
+        return self._unit_weighted
+
+    def to_adj_list(self) -> list[list[tuple[int, float]]]:
+        offsets = self.offsets
+        return [[(self.targets[e], self.weight(e)) for e in range(offsets[u], offsets[u + 1])]
+                for u in range(self.num_nodes)]
+
+    def save_binary(self, path: str):
+        n = self.num_nodes
+        m = self.num_edges
+        weighted = len(self.weights) != 0
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == "little", weighted, n, m))
+            f.write(_as_bytes(self.offsets, 'i'))
+            f.write(_as_bytes(self.targets, 'i'))
+            if weighted:
+                f.write(b"\0" * _padding(f.tell()))
+                f.write(_as_bytes(self.weights, 'd'))
+
+    @classmethod
+    def load_binary(cls, path: str) -> 'CSRGraph':
+        with open(path, "rb") as f:
+            # The mapping keeps its own handle on the file, so the file object can be closed straight away
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mm) < _HEADER.size:
+            raise ValueError("File too small to be a CSR graph!")
+        magic, version, little_endian, weighted, n, m = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("File is not a CSR graph of a supported version!")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError("CSR graph file was written with a different byte order!")
+
+        pos = _HEADER.size
+        targets_pos = pos + 4 * (n + 1)
+        weights_pos = targets_pos + 4 * m
+        weights_pos += _padding(weights_pos)
+        end = weights_pos + 8 * m if weighted else targets_pos + 4 * m
+        if len(mm) < end:
+            raise ValueError("CSR graph file is truncated!")
+
+        # The memoryviews hold a reference to the mapping, which stays open for as long as the graph is alive
+        buf = memoryview(mm)
+        offsets = buf[pos:targets_pos].cast('i')
+        targets = buf[targets_pos:targets_pos + 4 * m].cast('i')
+        weights = buf[weights_pos:end].cast('d') if weighted else array('d')
+        return cls(offsets, targets, weights)
+
+
+def _as_bytes(values, typecode: str):
+    if isinstance(values, memoryview):
+        return values
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+def _padding(pos: int) -> int:
+    return -pos % 8
+
+
+# Returns the graph as a CSRGraph, converting adjacency lists and passing CSRGraph instances through untouched. An
+# unweighted CSRGraph asked for as weighted gets its cached unit-weighted copy (see with_unit_weights), matching
+# weight().
+def as_csr(graph, weighted: bool = True) -> CSRGraph:
+    if isinstance(graph, CSRGraph):
+        return graph.with_unit_weights() if weighted else graph
+    return CSRGraph.from_adj_list(graph, weighted=weighted)
+
+
+# The (u, v, w) edges of a text edge file: one "u v [w]" line per edge, w defaulting to 1.0, with blank lines and lines
+# starting with '#' skipped. Read lazily, so the file is never held in memory as a whole.
+def read_edge_file(path: str) -> Iterator[tuple[int, int, float]]:
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            yield int(fields[0]), int(fields[1]), float(fields[2]) if len(fields) > 2 else 1.0
+
+
+# Callable giving the (neighbour, weight) pairs of node u. Adjacency lists are used as they are rather than converted,
+# so a search that settles only a few nodes does not pay for the whole graph; CSRGraph edges are zipped from slices.
+def edge_lister(graph):
+    if not isinstance(graph, CSRGraph):
+        return graph.__getitem__
+
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    if not graph.weighted:
+        return lambda u: zip(targets[offsets[u]:offsets[u + 1]], repeat(1.0))
+    return lambda u: zip(targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]])
@@ -5,6 +5,8 @@ to the user; instead the values of the set members are used directly in all oper
 This uses rank to implement the path compression.
 """
 
+from array import array
+
 
 class DisjointSet:
     class DisjointSetMember:
@@ -62,3 +64,177 @@ class DisjointSet:
 
     def contains_member(self, value) -> bool:
         return value in self._members
+
+
+"""
+IntDisjointSet - array-backed disjoint set over the integer keys 0..n-1. Parents and ranks live in two array('i')
+buffers, so each element costs 8 bytes instead of a member object plus a dict entry. find() uses path halving, which
+compresses in the same single pass that walks up to the root. union() finds each root exactly once and, like
+DisjointSet.union, returns the new root or None if both keys were already in the same set.
+
+KeyedDisjointSet is the same structure behind a dict from arbitrary hashable values to integer keys, and is a drop-in
+replacement for DisjointSet.
+"""
+
+
+class IntDisjointSet:
+    def __init__(self, n: int = 0):
+        self._parent = array('i', range(n))
+        self._rank = array('i', [0]) * n
+        self._count = n
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    @property
+    def num_components(self) -> int:
+        return self._count
+
+    # Adds a new singleton set and returns its key
+    def make_set(self) -> int:
+        key = len(self._parent)
+        self._parent.append(key)
+        self._rank.append(0)
+        self._count += 1
+        return key
+
+    def find(self, key: int) -> int:
+        if not 0 <= key < len(self._parent):
+            raise KeyError("Value not a member of the set!")
+        return self._root(key)
+
+    def union(self, x: int, y: int):
+        n = len(self._parent)
+        if not (0 <= x < n and 0 <= y < n):
+            raise KeyError("Values are not members of the set!")
+
+        x_root = self._root(x)
+        y_root = self._root(y)
+        if x_root == y_root:
+            return
+
+        rank = self._rank
+        if rank[x_root] < rank[y_root]:
+            x_root, y_root = y_root, x_root
+
+        self._parent[y_root] = x_root
+        if rank[x_root] == rank[y_root]:
+            rank[x_root] += 1
+        self._count -= 1
+
+        return x_root
+
+    # Bulk union; the finds are inlined to avoid two method calls per pair. Returns the number of merges performed.
+    def union_many(self, pairs) -> int:
+        parent = self._parent
+        rank = self._rank
+        n = len(parent)
+        merged = 0
+        try:
+            for x, y in pairs:
+                # Negative keys would otherwise index from the end of the arrays
+                if not (0 <= x < n and 0 <= y < n):
+                    raise KeyError("Values are not members of the set!")
+                while parent[x] != x:
+                    parent[x] = parent[parent[x]]
+                    x = parent[x]
+                while parent[y] != y:
+                    parent[y] = parent[parent[y]]
+                    y = parent[y]
+                if x == y:
+                    continue
+
+                if rank[x] < rank[y]:
+                    x, y = y, x
+                parent[y] = x
+                if rank[x] == rank[y]:
+                    rank[x] += 1
+                merged += 1
+        finally:
+            # Keep the component count right even if a bad key stops the batch part way through
+            self._count -= merged
+        return merged
+
+    def find_many(self, keys) -> array:
+        parent = self._parent
+        n = len(parent)
+        roots = array('i')
+        for key in keys:
+            if not 0 <= key < n:
+                raise KeyError("Value not a member of the set!")
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            roots.append(key)
+        return roots
+
+    # Root of key, which must be in range
+    def _root(self, key: int) -> int:
+        parent = self._parent
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    # Dense component label 0..num_components-1 for every key, numbered in order of each component's smallest key
+    def component_labels(self) -> array:
+        n = len(self._parent)
+        labels = array('i', [-1]) * n
+        roots = self.find_many(range(n))
+        next_label = 0
+        for key in range(n):
+            root = roots[key]
+            if labels[root] == -1:
+                labels[root] = next_label
+                next_label += 1
+            labels[key] = labels[root]
+        return labels
+
+
+class KeyedDisjointSet:
+    def __init__(self):
+        self._keys = {}
+        self._values = []
+        self._set = IntDisjointSet()
+
+    def make_set(self, value):
+        if value not in self._keys:
+            self._keys[value] = self._set.make_set()
+            self._values.append(value)
+
+        return value
+
+    def find(self, value):
+        if value not in self._keys:
+            raise KeyError("Value not a member of the set!")
+
+        return self._values[self._set.find(self._keys[value])]
+
+    def union(self, x, y):
+        if x not in self._keys or y not in self._keys:
+            raise KeyError("Values are not members of the set!")
+
+        root = self._set.union(self._keys[x], self._keys[y])
+        return None if root is None else self._values[root]
+
+    def union_many(self, pairs) -> int:
+        keys = self._keys
+        try:
+            return self._set.union_many((keys[x], keys[y]) for x, y in pairs)
+        except KeyError:
+            raise KeyError("Values are not members of the set!") from None
+
+    def find_many(self, values) -> list:
+        keys = self._keys
+        try:
+            roots = self._set.find_many(keys[value] for value in values)
+        except KeyError:
+            raise KeyError("Value not a member of the set!") from None
+        return [self._values[root] for root in roots]
+
+    # Maps every member to a dense component label
+    def component_labels(self) -> dict:
+        return dict(zip(self._values, self._set.component_labels()))
+
+    def contains_member(self, value) -> bool:
+        return value in self._keys
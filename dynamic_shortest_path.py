@@ -0,0 +1,135 @@
+"""
+DynamicShortestPaths - single-source shortest-path tree that is repaired in place when edges change, in the style of
+Ramalingam-Reps, instead of rerunning Dijkstra over the whole graph. Weights must be non-negative.
+
+    weight decrease / insertion - if the edge now gives its head a shorter distance, a Dijkstra pass is seeded at the
+                                  head and only continues through nodes whose distance actually drops
+    weight increase / deletion  - only matters for tree edges; the subtree hanging off the edge is detached, each of
+                                  its nodes is reseeded with its best edge from outside the subtree and a Dijkstra
+                                  pass restricted to improvements settles the rest
+
+Either way the work is proportional to the number of nodes whose distance or parent changes, plus their edges.
+The graph is kept as per-node dicts (neighbour -> weight) since it is mutable; parallel edges collapse to the cheapest.
+"""
+
+import csr_graph
+import indexed_priority_queue
+import path_finding
+
+
+class DynamicShortestPaths:
+    def __init__(self, adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, source: int):
+        graph = csr_graph.as_csr(adj_list)
+        n = len(graph)
+        self.source = source
+        self._out = [{} for _ in range(n)]
+        self._in = [{} for _ in range(n)]
+        for u in range(n):
+            for e in range(graph.offsets[u], graph.offsets[u + 1]):
+                v = graph.targets[e]
+                w = graph.weights[e]
+                if w < 0:
+                    raise ValueError("Edge weights must be non-negative!")
+                if v not in self._out[u] or w < self._out[u][v]:
+                    self._out[u][v] = w
+                    self._in[v][u] = w
+
+        dist, prev = path_finding.ShortestPathEngine(graph).single_source(source)
+        self._dist = list(dist)
+        self._prev = list(prev)
+        self._children = [set() for _ in range(n)]
+        for v in range(n):
+            if self._prev[v] != -1:
+                self._children[self._prev[v]].add(v)
+        self._pq = indexed_priority_queue.IndexedPriorityQueue(n)
+
+    def __len__(self) -> int:
+        return len(self._dist)
+
+    def distance(self, v: int) -> float:
+        return self._dist[v]
+
+    # Same (distance, path) as dijkstra_shortest_path from the source; (inf, []) if v is unreachable
+    def query(self, v: int) -> tuple[float, list[int]]:
+        if self._dist[v] == float("inf"):
+            return float("inf"), []
+
+        path = []
+        pos = v
+        while pos != -1:
+            path.append(pos)
+            pos = self._prev[pos]
+
+        return self._dist[v], path[::-1]
+
+    def insert_edge(self, u: int, v: int, w: float):
+        if v in self._out[u]:
+            raise KeyError("Edge already exists!")
+        self.update_edge(u, v, w)
+
+    def delete_edge(self, u: int, v: int):
+        if v not in self._out[u]:
+            raise KeyError("Edge does not exist!")
+        del self._out[u][v]
+        del self._in[v][u]
+        if self._prev[v] == u:
+            self._repair_subtree(v)
+
+    # Sets the weight of u -> v, inserting the edge if it does not exist yet
+    def update_edge(self, u: int, v: int, w: float):
+        if w < 0:
+            raise ValueError("Edge weights must be non-negative!")
+        old = self._out[u].get(v)
+        if old == w:
+            return
+
+        self._out[u][v] = w
+        self._in[v][u] = w
+        if old is None or w < old:
+            if self._dist[u] + w < self._dist[v]:
+                self._set_parent(v, u, self._dist[u] + w)
+                self._pq.push(v, self._dist[v])
+                self._propagate()
+        elif self._prev[v] == u:
+            self._repair_subtree(v)
+
+    # The distances of the subtree rooted at root can only have grown; recompute them from the rest of the tree
+    def _repair_subtree(self, root: int):
+        inf = float("inf")
+        affected = [root]
+        i = 0
+        while i < len(affected):
+            affected.extend(self._children[affected[i]])
+            i += 1
+
+        for x in affected:
+            self._set_parent(x, -1, inf)
+
+        for x in affected:
+            for y, w in self._in[x].items():
+                if self._dist[y] + w < self._dist[x]:
+                    self._set_parent(x, y, self._dist[y] + w)
+            if self._dist[x] != inf:
+                self._pq.push(x, self._dist[x])
+        self._propagate()
+
+    # Dijkstra pass from whatever is queued; only continues through nodes whose distance improves
+    def _propagate(self):
+        pq = self._pq
+        dist = self._dist
+        while pq:
+            curr_dist, curr_index = pq.pop()
+            for n_node, w in self._out[curr_index].items():
+                n_dist = curr_dist + w
+                if n_dist < dist[n_node]:
+                    self._set_parent(n_node, curr_index, n_dist)
+                    pq.push_or_decrease(n_node, n_dist)
+
+    def _set_parent(self, v: int, parent: int, dist: float):
+        old = self._prev[v]
+        if old != -1:
+            self._children[old].discard(v)
+        if parent != -1:
+            self._children[parent].add(v)
+        self._prev[v] = parent
+        self._dist[v] = dist
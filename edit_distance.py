@@ -22,9 +22,101 @@ def edit_distance(a: Sequence, b: Sequence) -> int:
             sub_cost = 0 if a[i-1] == b[j-1] else 1
             m1[j] = min(m1[j-1]+1, m0[j]+1, m0[j-1] + sub_cost)
 
-        m0 = m1[::]
+        # Every cell of m1 is rewritten on the next row, so the rows can simply be swapped instead of copied
+        m0, m1 = m1, m0
+
+    return m0[-1]
+
+
+# Myers' bit-vector algorithm (in Hyyro's formulation for edit distance). The column of DP differences against the
+# shorter sequence is held as two Python ints of positive/negative vertical deltas, so each element of the longer
+# sequence costs a constant number of big-int operations, i.e. O(ceil(m/w)) machine words. Elements must be
+# hashable to build the match masks; otherwise this falls back to edit_distance.
+def edit_distance_bitparallel(a: Sequence, b: Sequence) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(b)
+    if m == 0:
+        return len(a)
+
+    peq = {}
+    try:
+        for i, c in enumerate(b):
+            peq[c] = peq.get(c, 0) | (1 << i)
+        # Looking up the longer sequence needs its elements hashable too, so check them all before starting
+        for c in a:
+            hash(c)
+    except TypeError:
+        return edit_distance(a, b)
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv = mask  # vertical +1 deltas; the first column is 0, 1, ..., m
+    mv = 0  # vertical -1 deltas
+    score = m
+
+    for c in a:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+
+        # The top row of the DP grows by one per column, hence the 1 shifted in
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+
+    return score
+
+
+# Ukkonen's banded edit distance: only cells within max_distance of the diagonal can lead to a result within the
+# cutoff, so each row costs O(max_distance). Returns max_distance + 1 as soon as the distance is known to exceed
+# max_distance, including as soon as every cell of a row does.
+def edit_distance_banded(a: Sequence, b: Sequence, max_distance: int) -> int:
+    over = max_distance + 1
+    if len(a) < len(b):
+        a, b = b, a
+    a_len = len(a)
+    b_len = len(b)
 
-    return m1[-1]
+    if a_len - b_len > max_distance:
+        return over
+    if b_len == 0:
+        return a_len
+
+    m0 = [j if j <= max_distance else over for j in range(b_len+1)]
+    m1 = [over] * (b_len+1)
+
+    for i in range(1, a_len+1):
+        lo = max(1, i - max_distance)
+        hi = min(b_len, i + max_distance)
+        m1[lo-1] = min(i, over) if lo == 1 else over
+        row_min = m1[lo-1]
+
+        for j in range(lo, hi+1):
+            sub_cost = 0 if a[i-1] == b[j-1] else 1
+            v = min(m1[j-1]+1, m0[j]+1, m0[j-1] + sub_cost, over)
+            m1[j] = v
+            if v < row_min:
+                row_min = v
+
+        # The next row reads one cell past this band; it lies outside the band, so it counts as over the cutoff
+        if hi < b_len:
+            m1[hi+1] = over
+
+        if row_min > max_distance:
+            return over
+
+        m0, m1 = m1, m0
+
+    return m0[b_len]
 
 
 # Returns one instance of the longest common subsequence. Can be easily extended to return all longest subsequences.
@@ -54,3 +146,91 @@ def longest_common_subsequence(a: str, b: str) -> str:
         m0 = m1[::]
 
     return m1[-1]
+
+
+# Hirschberg's divide and conquer LCS: the LCS lengths of the first half of the longer input against every prefix of
+# the shorter, and of its second half against every suffix, give the point where an optimal alignment crosses its
+# middle row. Both halves are then solved independently on index ranges (no slicing), so the rows are as long as the
+# shorter input, memory is O(n + m) and recursion depth is O(log max(n, m)). Returns a str if both inputs are str,
+# otherwise a list of the elements of a.
+def lcs_hirschberg(a: Sequence, b: Sequence):
+    result = []
+    if len(b) > len(a):
+        _hirschberg(b, 0, len(b), a, 0, len(a), result, take_b=True)
+    else:
+        _hirschberg(a, 0, len(a), b, 0, len(b), result, take_b=False)
+    if isinstance(a, str) and isinstance(b, str):
+        return "".join(result)
+    return result
+
+
+# Splits a; the matched elements are taken from b if take_b, so they always come from the caller's first input
+def _hirschberg(a: Sequence, a_lo: int, a_hi: int, b: Sequence, b_lo: int, b_hi: int, result: list, take_b: bool):
+    if a_lo == a_hi or b_lo == b_hi:
+        return
+
+    if a_hi - a_lo == 1:
+        c = a[a_lo]
+        for j in range(b_lo, b_hi):
+            if b[j] == c:
+                result.append(b[j] if take_b else c)
+                return
+        return
+
+    mid = (a_lo + a_hi) // 2
+    forward = _lcs_row(a, a_lo, mid, b, b_lo, b_hi, reverse=False)
+    backward = _lcs_row(a, mid, a_hi, b, b_lo, b_hi, reverse=True)
+
+    b_len = b_hi - b_lo
+    split = max(range(b_len+1), key=lambda j: forward[j] + backward[b_len - j])
+    _hirschberg(a, a_lo, mid, b, b_lo, b_lo + split, result, take_b)
+    _hirschberg(a, mid, a_hi, b, b_lo + split, b_hi, result, take_b)
+
+
+# Last row of the LCS length DP of a[a_lo:a_hi] against b[b_lo:b_hi] (both read back to front if reverse): entry j is
+# the LCS length against the first j elements of b (or the last j elements if reverse)
+def _lcs_row(a: Sequence, a_lo: int, a_hi: int, b: Sequence, b_lo: int, b_hi: int, reverse: bool) -> list[int]:
+    b_len = b_hi - b_lo
+    m0 = [0] * (b_len+1)
+    m1 = [0] * (b_len+1)
+    a_range = range(a_hi-1, a_lo-1, -1) if reverse else range(a_lo, a_hi)
+    b_items = [b[j] for j in (range(b_hi-1, b_lo-1, -1) if reverse else range(b_lo, b_hi))]
+
+    for i in a_range:
+        c = a[i]
+        for j in range(1, b_len+1):
+            if b_items[j-1] == c:
+                m1[j] = m0[j-1] + 1
+            else:
+                m1[j] = m1[j-1] if m1[j-1] > m0[j] else m0[j]
+        m0, m1 = m1, m0
+
+    return m0
+
+
+# LCS length with the bit-parallel method of Allison-Dix / Hyyro: a Python int holds one bit per element of the
+# shorter sequence, and each element of the longer one costs a constant number of big-int operations, i.e.
+# O(n * ceil(m/w)) word operations. Falls back to the row DP for unhashable elements.
+def lcs_length(a: Sequence, b: Sequence) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(b)
+    if m == 0:
+        return 0
+
+    peq = {}
+    try:
+        for i, c in enumerate(b):
+            peq[c] = peq.get(c, 0) | (1 << i)
+        for c in a:
+            hash(c)
+    except TypeError:
+        return _lcs_row(a, 0, len(a), b, 0, m, reverse=False)[-1]
+
+    mask = (1 << m) - 1
+    v = mask  # zero bits mark the positions where the LCS length grows
+    for c in a:
+        u = v & peq.get(c, 0)
+        v = ((v + u) | (v - u)) & mask
+
+    return m - v.bit_count()
@@ -0,0 +1,172 @@
+"""
+FMIndex - compressed full-text self-index built from suffix_array.suffix_array_compact(). The text is not kept; what is
+stored is its Burrows-Wheeler transform plus enough to rank characters in it and to recover positions:
+
+    bwt         bytearray (array('i') for alphabets over 256) - the character before each suffix, in suffix order,
+                over the dense codes of the characters present. The row of the whole text (no character before it) holds
+                code 0 as a placeholder and is excluded from ranks.
+    occ         array('i') - rank checkpoints: occurrences of every code in bwt[:b * occ_rate], for every block b.
+                A rank is a checkpoint plus a count over less than occ_rate characters, done by bytearray.count in C.
+    samples     array('i') - the suffix array entries that are multiples of sa_rate, in row order, with a bitvector
+                (64-bit words plus per-word rank) marking the sampled rows
+
+count() is a backward search: two ranks per pattern character, O(m). locate() walks each matching row back through the
+LF mapping until it reaches a sampled row, at most sa_rate - 1 steps, so sa_rate trades the 4 / sa_rate bytes per
+character of samples against locate latency. occ_rate defaults to the smallest power of two keeping the checkpoints at
+or under half a byte per character. size_ratio() is the index size as a multiple of the input at one byte per
+character.
+"""
+
+import suffix_array
+from array import array
+from collections import Counter
+from typing import Sequence
+
+
+class FMIndex:
+    def __init__(self, text: str | bytes | memoryview, sa_rate: int = 32, occ_rate: int = None):
+        if sa_rate < 1 or (occ_rate is not None and occ_rate < 1):
+            raise ValueError("Sampling rates must be at least 1!")
+        self.is_str = isinstance(text, str)
+        codes, self.alphabet = _dense_codes(text)
+        sigma = len(self.alphabet)
+        self._code_of = {c: code for code, c in enumerate(self.alphabet)}
+        self.sa_rate = sa_rate
+        self.occ_rate = occ_rate if occ_rate is not None else _default_occ_rate(sigma)
+        n = len(codes)
+        self.n = n
+
+        # C[c]: rows whose suffix starts with a smaller code, the sentinel suffix at row 0 included
+        counts = Counter(codes)
+        self._c = array('i', [0]) * (sigma + 1)
+        total = 1
+        for c in range(sigma):
+            self._c[c] = total
+            total += counts.get(c, 0)
+        self._c[sigma] = total
+
+        # Row 0 is the sentinel suffix (position n); row r > 0 is the suffix at sa[r - 1]
+        sa = suffix_array.suffix_array_compact(codes)
+        bwt = bytearray(n + 1) if sigma <= 256 else array('i', [0]) * (n + 1)
+        bwt[0] = codes[n - 1] if n else 0
+        self.dollar_row = 0
+        num_words = (n + 1 + 63) // 64
+        words = [0] * num_words
+        self._samples = array('i')
+        if n % sa_rate == 0:
+            words[0] |= 1
+            self._samples.append(n)
+        for r in range(1, n + 1):
+            p = sa[r - 1]
+            if p:
+                bwt[r] = codes[p - 1]
+            else:
+                self.dollar_row = r
+            if p % sa_rate == 0:
+                words[r >> 6] |= 1 << (r & 63)
+                self._samples.append(p)
+        self.bwt = bwt
+
+        self._sampled = array('Q', words)
+        self._sampled_rank = array('i', [0]) * (num_words + 1)
+        for w in range(num_words):
+            self._sampled_rank[w + 1] = self._sampled_rank[w] + words[w].bit_count()
+
+        rate = self.occ_rate
+        self._occ = array('i', [0]) * (((n + 1) // rate + 1) * sigma)
+        running = [0] * sigma
+        for b in range(1, (n + 1) // rate + 1 if sigma else 0):
+            for c, k in Counter(self.bwt[(b - 1) * rate:b * rate]).items():
+                running[c] += k
+            self._occ[b * sigma:(b + 1) * sigma] = array('i', running)
+
+    def __len__(self) -> int:
+        return self.n
+
+    # Occurrences of code c in bwt[:i], not counting the placeholder in the sentinel row
+    def _rank(self, c: int, i: int) -> int:
+        block = i // self.occ_rate
+        start = block * self.occ_rate
+        bwt = self.bwt
+        res = self._occ[block * len(self.alphabet) + c]
+        res += bwt.count(c, start, i) if isinstance(bwt, bytearray) else bwt[start:i].count(c)
+        if c == 0 and self.dollar_row < i:
+            res -= 1
+        return res
+
+    # [sp, ep) rows whose suffixes start with pattern
+    def _range(self, pattern: str | bytes) -> tuple[int, int]:
+        if isinstance(pattern, str) != self.is_str:
+            raise TypeError("Pattern must be of the same type as the text!")
+        if not pattern:
+            # Every row but the sentinel's, so the empty pattern counts the n suffixes of the text like SuffixIndex
+            return 1, self.n + 1
+        sp = 0
+        ep = self.n + 1
+        for ch in reversed(pattern):
+            c = self._code_of.get(ch)
+            if c is None:
+                return 0, 0
+            sp = self._c[c] + self._rank(c, sp)
+            ep = self._c[c] + self._rank(c, ep)
+            if sp >= ep:
+                return 0, 0
+        return sp, ep
+
+    def count(self, pattern: str | bytes) -> int:
+        sp, ep = self._range(pattern)
+        return ep - sp
+
+    # Start positions of every occurrence of pattern, ascending
+    def locate(self, pattern: str | bytes) -> list[int]:
+        sp, ep = self._range(pattern)
+        return sorted(self._position(r) for r in range(sp, ep))
+
+    def _position(self, r: int) -> int:
+        sampled = self._sampled
+        steps = 0
+        while not (sampled[r >> 6] >> (r & 63)) & 1:
+            c = self.bwt[r]
+            r = self._c[c] + self._rank(c, r)
+            steps += 1
+        word = r >> 6
+        sample = self._sampled_rank[word] + (sampled[word] & ((1 << (r & 63)) - 1)).bit_count()
+        return self._samples[sample] + steps
+
+    def size_bytes(self) -> int:
+        return sum(len(buf) * (buf.itemsize if isinstance(buf, array) else 1)
+                   for buf in (self.bwt, self._occ, self._samples, self._sampled, self._sampled_rank, self._c))
+
+    # Index size as a multiple of the input at one byte per character
+    def size_ratio(self) -> float:
+        return self.size_bytes() / max(self.n, 1)
+
+
+# The text as dense codes 0..sigma-1 in character order, and the characters (as str or byte values) by code
+def _dense_codes(text: str | bytes | memoryview) -> tuple[Sequence[int], list]:
+    if isinstance(text, str):
+        alphabet = sorted(set(text))
+        if not alphabet or alphabet[-1] < '\u0100':
+            table = bytearray(256)
+            for code, ch in enumerate(alphabet):
+                table[ord(ch)] = code
+            return text.encode("latin-1").translate(table), alphabet
+        code_of = {ch: code for code, ch in enumerate(alphabet)}
+        return array('i', map(code_of.__getitem__, text)), alphabet
+
+    if memoryview(text).format not in ('B', 'c'):
+        raise TypeError("Text must be str or a bytes-like object of unsigned bytes!")
+    data = bytes(text)
+    alphabet = sorted(set(data))
+    table = bytearray(256)
+    for code, b in enumerate(alphabet):
+        table[b] = code
+    return data.translate(table), alphabet
+
+
+# Smallest power of two (at least 64) keeping sigma 4-byte checkpoints per block at half a byte per character or less
+def _default_occ_rate(sigma: int) -> int:
+    rate = 64
+    while 4 * sigma > rate // 2:
+        rate *= 2
+    return rate
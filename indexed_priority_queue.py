@@ -0,0 +1,129 @@
+"""
+IndexedPriorityQueue - d-ary min-heap over the integer ids 0..n-1 with decrease-key. Every id is in the queue at most
+once, so the heap never holds more than n entries (unlike pushing duplicates onto heapq and skipping stale ones).
+The heap, the position of each id within it and the keys are flat arrays; nothing is allocated per push.
+
+A 4-ary heap is the default: it halves the depth of a binary heap, which makes the decrease-keys that dominate
+Dijkstra/Prim cheaper, at the cost of comparing more children per level on pop.
+"""
+
+from array import array
+
+
+class IndexedPriorityQueue:
+    def __init__(self, n: int, d: int = 4):
+        if d < 2:
+            raise ValueError("Heap arity must be at least 2!")
+        self._d = d
+        self._size = 0
+        self._heap = array('i')  # grown on push, so a search that reaches few ids never touches n heap slots
+        self._pos = array('i', [-1]) * n  # position of each id in _heap, -1 if not queued
+        self._keys = array('d', [0.0]) * n
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item: int) -> bool:
+        return self._pos[item] != -1
+
+    def key(self, item: int) -> float:
+        if self._pos[item] == -1:
+            raise KeyError("Item not in the queue!")
+        return self._keys[item]
+
+    def push(self, item: int, key: float):
+        if self._pos[item] != -1:
+            raise KeyError("Item already in the queue!")
+        if self._size == len(self._heap):
+            self._heap.append(item)
+        else:
+            self._heap[self._size] = item
+        self._pos[item] = self._size
+        self._keys[item] = key
+        self._size += 1
+        self._sift_up(self._size - 1)
+
+    def decrease_key(self, item: int, key: float):
+        if self._pos[item] == -1:
+            raise KeyError("Item not in the queue!")
+        if key > self._keys[item]:
+            raise ValueError("New key is larger than the current key!")
+        self._keys[item] = key
+        self._sift_up(self._pos[item])
+
+    # Pushes item, or lowers its key if it is already queued with a larger one. Returns whether the key changed.
+    def push_or_decrease(self, item: int, key: float) -> bool:
+        pos = self._pos[item]
+        if pos == -1:
+            self.push(item, key)
+            return True
+        if key < self._keys[item]:
+            self._keys[item] = key
+            self._sift_up(pos)
+            return True
+        return False
+
+    def peek(self) -> tuple[float, int]:
+        if self._size == 0:
+            raise IndexError("Peek from an empty queue!")
+        return self._keys[self._heap[0]], self._heap[0]
+
+    def pop(self) -> tuple[float, int]:
+        if self._size == 0:
+            raise IndexError("Pop from an empty queue!")
+        heap = self._heap
+        top = heap[0]
+        self._size -= 1
+        self._pos[top] = -1
+        if self._size > 0:
+            last = heap[self._size]
+            heap[0] = last
+            self._pos[last] = 0
+            self._sift_down(0)
+        return self._keys[top], top
+
+    # Both sifts move the hole rather than swapping, so each level costs one write instead of two
+    def _sift_up(self, i: int):
+        heap = self._heap
+        pos = self._pos
+        keys = self._keys
+        d = self._d
+        item = heap[i]
+        key = keys[item]
+        while i > 0:
+            parent = (i - 1) // d
+            parent_item = heap[parent]
+            if keys[parent_item] <= key:
+                break
+            heap[i] = parent_item
+            pos[parent_item] = i
+            i = parent
+        heap[i] = item
+        pos[item] = i
+
+    def _sift_down(self, i: int):
+        heap = self._heap
+        pos = self._pos
+        keys = self._keys
+        d = self._d
+        size = self._size
+        item = heap[i]
+        key = keys[item]
+        while True:
+            first = i * d + 1
+            if first >= size:
+                break
+            best = first
+            best_key = keys[heap[first]]
+            for child in range(first + 1, min(first + d, size)):
+                child_key = keys[heap[child]]
+                if child_key < best_key:
+                    best = child
+                    best_key = child_key
+            if best_key >= key:
+                break
+            heap[i] = heap[best]
+            pos[heap[i]] = i
+            i = best
+        heap[i] = item
+        pos[item] = i
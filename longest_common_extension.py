@@ -0,0 +1,77 @@
+"""
+LongestCommonExtension - length of the longest common prefix of any two suffixes of a text in O(1), after building the
+suffix array, its inverse (rank) and the Kasai LCP array once. The LCP of the suffixes at i and j is the minimum of the
+adjacent LCPs between their ranks, answered by an idempotent-min sparse table over the LCP array.
+
+The sparse table is a single 2-D int32 NumPy array, built level by level with np.minimum. lce() reads it through
+memoryviews of its rows, one Python int per lookup; lce_many() answers a batch at once with a handful of gathers and
+one np.minimum over the same array.
+"""
+
+import numpy as np
+import suffix_array
+from array import array
+from typing import Sequence
+
+
+class LongestCommonExtension:
+    def __init__(self, s: Sequence):
+        self.n = len(s)
+        self.sa = suffix_array.suffix_array_compact(s)
+        self.rank = array('i', [0]) * self.n
+        for i in range(self.n):
+            self.rank[self.sa[i]] = i
+        self.lcp = suffix_array.lcp_array_compact(s, self.sa, self.rank)
+        self._levels = _min_sparse_table(self.lcp)
+        self._rows = [memoryview(row) for row in self._levels]
+
+    def __len__(self) -> int:
+        return self.n
+
+    # Length of the common prefix of the suffixes starting at i and j
+    def lce(self, i: int, j: int) -> int:
+        if i == j:
+            return self.n - i
+        a = self.rank[i]
+        b = self.rank[j]
+        if a > b:
+            a, b = b, a
+        # Adjacent LCPs a..b-1, covered by two overlapping power-of-two windows
+        level = (b - a).bit_length() - 1
+        row = self._rows[level]
+        x = row[a]
+        y = row[b - (1 << level)]
+        return x if x < y else y
+
+    # lce() for every (i, j) in pairs, as a NumPy integer array
+    def lce_many(self, pairs):
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        i = pairs[:, 0]
+        j = pairs[:, 1]
+        if len(pairs) and (pairs.min() < 0 or pairs.max() >= self.n):
+            raise IndexError("Suffix position out of range!")
+
+        rank = np.frombuffer(self.rank, dtype=np.int32)
+        ri = rank[i]
+        rj = rank[j]
+        lo = np.minimum(ri, rj)
+        hi = np.maximum(ri, rj) - 1  # inclusive range of adjacent LCPs
+        same = i == j
+        lo[same] = hi[same] = 0  # placeholder range, overwritten below
+        level = np.log2(hi - lo + 1).astype(np.intp)
+        res = np.minimum(self._levels[level, lo], self._levels[level, hi - (1 << level) + 1])
+        res[same] = self.n - i[same]
+        return res
+
+
+# levels[k, x] is the minimum of values[x:x + 2 ** k], for every window that fits
+def _min_sparse_table(values: array):
+    m = len(values)
+    levels = np.zeros((max(m, 1).bit_length(), max(m, 1)), dtype=np.int32)
+    levels[0, :m] = np.frombuffer(values, dtype=np.int32)
+    half = 1
+    for k in range(1, len(levels)):
+        width = m - 2 * half + 1
+        levels[k, :width] = np.minimum(levels[k - 1, :width], levels[k - 1, half:half + width])
+        half *= 2
+    return levels
@@ -1,49 +1,247 @@
+import csr_graph
 import disjoint_set
 import heapq
+import indexed_priority_queue
+import os
+import struct
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
 
 
 # Minimum spanning tree algorithms
 
 
 # Kruskal
-def kruskal_mst(adj_list: list[list[tuple[int, float]]]) -> list[(int, int)]:
-    n = len(adj_list)
-    djs = disjoint_set.DisjointSet()
+def kruskal_mst(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph) -> list[(int, int)]:
+    graph = csr_graph.as_csr(adj_list)
+    n = len(graph)
+    djs = disjoint_set.IntDisjointSet(n)
     mst = []
-    for i in range(n):
-        djs.make_set(i)
-    edges = []
-    for i, l in enumerate(adj_list):
-        for item in l:
-            edges.append((item[1], i, item[0]))
-    edges.sort()
-    for edge in edges:
-        if djs.find(edge[1]) != djs.find(edge[2]):
-            mst.append((edge[1], edge[2]))
-            djs.union(edge[1], edge[2])
+    sources = graph.edge_sources()
+    targets = graph.targets
+    weights = graph.weights
+    # Edge indices in (weight, u, v) order, as the tuples were sorted before, so ties pick the same edges as
+    # external_kruskal_mst. Three stable sorts on plain keys, least significant first, avoid a tuple per edge.
+    edges = sorted(range(graph.num_edges), key=targets.__getitem__)
+    edges.sort(key=sources.__getitem__)
+    edges.sort(key=weights.__getitem__)
+    for e in edges:
+        u = sources[e]
+        v = targets[e]
+        # union() reports whether the edge joined two trees, so each endpoint is only looked up once
+        if djs.union(u, v) is not None:
+            mst.append((u, v))
 
     return mst
 
 
+# Boruvka - each round, every component picks its cheapest outgoing edge and all of those edges are added at once,
+# which at least halves the number of components. The edge list is split into one partition per worker and the
+# per-round scans run in a process pool; the edge arrays are sent to each worker once, and only the current component
+# labels travel with each task. Ties are broken by edge index so the chosen edges can never form a cycle. Returns a
+# spanning forest if the graph is disconnected.
+def boruvka_mst(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, max_workers: int = None) \
+        -> list[(int, int)]:
+    graph = csr_graph.as_csr(adj_list)
+    n = len(graph)
+    m = graph.num_edges
+    sources = graph.edge_sources()
+    targets = graph.targets
+    weights = array('d', graph.weights)
+    djs = disjoint_set.IntDisjointSet(n)
+    mst = []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    bounds = [(m * i // max_workers, m * (i + 1) // max_workers) for i in range(max_workers)]
+
+    pool = None
+    if max_workers > 1:
+        pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_boruvka_init,
+                                   initargs=(sources, array('i', targets), weights))
+    try:
+        while djs.num_components > 1:
+            labels = djs.find_many(range(n))
+            if pool is None:
+                partials = [_cheapest_edges(sources, targets, weights, labels, 0, m)]
+            else:
+                partials = list(pool.map(_boruvka_scan, [labels] * len(bounds), *zip(*bounds)))
+
+            cheapest = {}
+            for partial in partials:
+                for component, candidate in partial.items():
+                    if component not in cheapest or candidate < cheapest[component]:
+                        cheapest[component] = candidate
+
+            if not cheapest:
+                break  # the remaining components have no edges between them
+
+            for _, e in cheapest.values():
+                if djs.union(sources[e], targets[e]) is not None:
+                    mst.append((sources[e], targets[e]))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return mst
+
+
+# Cheapest (weight, edge index) leaving each component among edges start..stop-1
+def _cheapest_edges(sources, targets, weights, labels, start: int, stop: int) -> dict:
+    cheapest = {}
+    for e in range(start, stop):
+        cu = labels[sources[e]]
+        cv = labels[targets[e]]
+        if cu == cv:
+            continue
+        candidate = (weights[e], e)
+        if cu not in cheapest or candidate < cheapest[cu]:
+            cheapest[cu] = candidate
+        if cv not in cheapest or candidate < cheapest[cv]:
+            cheapest[cv] = candidate
+    return cheapest
+
+
+_boruvka_edges = None
+
+
+def _boruvka_init(sources: array, targets: array, weights: array):
+    global _boruvka_edges
+    _boruvka_edges = (sources, targets, weights)
+
+
+def _boruvka_scan(labels: array, start: int, stop: int) -> dict:
+    return _cheapest_edges(*_boruvka_edges, labels, start, stop)
+
+
+# External-memory Kruskal for edge sets larger than memory. edges is either an iterable of (u, v, w) or the path of a
+# text edge file in the CSRGraph.from_file format. Edges are sorted in chunks of chunk_size, each sorted run is spilled
+# to a temporary binary file and the runs are streamed back through heapq.merge into the disjoint set, stopping as soon
+# as n - 1 edges have been accepted. At most _MERGE_FAN_IN runs are open at once: with more, groups of them are first
+# merged into longer runs, pass by pass. Each open run reads blocks of chunk_size // _MERGE_FAN_IN records, so the
+# buffers of a merge add up to about one chunk and memory is bounded by the chunk size plus the O(V) disjoint set.
+def external_kruskal_mst(edges: Iterable[tuple[int, int, float]] | str, n: int, chunk_size: int = 1_000_000,
+                         tmp_dir: str = None) -> list[(int, int)]:
+    if isinstance(edges, str):
+        edges = csr_graph.read_edge_file(edges)
+
+    djs = disjoint_set.IntDisjointSet(n)
+    mst = []
+    if n <= 1:
+        return mst
+
+    block_records = max(1, chunk_size // _MERGE_FAN_IN)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        runs = []
+        chunk = []
+        for u, v, w in edges:
+            chunk.append((w, u, v))
+            if len(chunk) >= chunk_size:
+                runs.append(_write_run(chunk, run_dir, len(runs), block_records))
+                chunk = []
+
+        # Without any run the edges fit in one chunk and are merged straight from memory; otherwise what is left over
+        # is spilled too, so the merge holds nothing but its read buffers
+        if runs:
+            runs.append(_write_run(chunk, run_dir, len(runs), block_records))
+            chunk = []
+        chunk.sort()
+
+        next_index = len(runs)
+        while len(runs) > _MERGE_FAN_IN:
+            merged = []
+            for start in range(0, len(runs), _MERGE_FAN_IN):
+                group = runs[start:start + _MERGE_FAN_IN]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                merged.append(_merge_runs(group, run_dir, next_index, block_records))
+                next_index += 1
+            runs = merged
+
+        readers = [_read_run(run, block_records) for run in runs]
+        for _, u, v in heapq.merge(*readers, chunk):
+            if djs.union(u, v) is not None:
+                mst.append((u, v))
+                if len(mst) == n - 1:
+                    break
+
+        # Stopping early leaves the run files open; close them before the directory is removed
+        for reader in readers:
+            reader.close()
+
+    return mst
+
+
+_EDGE_RECORD = struct.Struct("<dii")  # weight, u, v
+_MERGE_FAN_IN = 64
+
+
+def _write_run(chunk: list[tuple[float, int, int]], run_dir: str, index: int, block_records: int) -> str:
+    chunk.sort()
+    return _write_records(chunk, run_dir, index, block_records)
+
+
+# Merges sorted runs into one new run and deletes them
+def _merge_runs(runs: list[str], run_dir: str, index: int, block_records: int) -> str:
+    path = _write_records(heapq.merge(*(_read_run(run, block_records) for run in runs)), run_dir, index,
+                          block_records)
+    for run in runs:
+        os.remove(run)
+    return path
+
+
+def _write_records(records: Iterable[tuple[float, int, int]], run_dir: str, index: int, block_records: int) -> str:
+    path = os.path.join(run_dir, f"run_{index}.bin")
+    records = iter(records)
+    with open(path, "wb") as f:
+        while True:
+            block = b"".join(_EDGE_RECORD.pack(*edge) for edge in islice(records, block_records))
+            if not block:
+                return path
+            f.write(block)
+
+
+def _read_run(path: str, block_records: int) -> Iterator[tuple[float, int, int]]:
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_EDGE_RECORD.size * block_records)
+            if not block:
+                return
+            yield from _EDGE_RECORD.iter_unpack(block)
+
+
 # Prim
-def prim_mst(adj_list: list[list[tuple[int, float]]]) -> list[(int, int)]:
-    n = len(adj_list)
-    key_parent = [(0.0, 0, 0)]  # key, parent index, current index
+def prim_mst(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph) -> list[(int, int)]:
+    graph = csr_graph.as_csr(adj_list)
+    n = len(graph)
+    if n == 0:
+        return []
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    key = [float("inf")] * n  # cheapest known edge from the tree to each node
+    parent = [-1] * n
     mst = []
     seen = [False] * n
-    seen[0] = True
+    # One entry per node whose key is lowered in place, rather than one heap entry per scanned edge
+    pq = indexed_priority_queue.IndexedPriorityQueue(n)
+    pq.push(0, 0.0)
 
     while len(mst) < n-1:
-        curr = heapq.heappop(key_parent)
-        if curr[1] != curr[2]:
-            if not seen[curr[2]]:
-                mst.append((curr[1], curr[2]))
-            else:
-                continue
-        seen[curr[2]] = True
+        _, curr = pq.pop()
+        if parent[curr] != -1:
+            mst.append((parent[curr], curr))
+        seen[curr] = True
 
-        for item in adj_list[curr[2]]:
-            if not seen[item[0]]:
-                heapq.heappush(key_parent, (item[1], curr[2], item[0]))
+        for e in range(offsets[curr], offsets[curr + 1]):
+            n_node = targets[e]
+            if not seen[n_node] and weights[e] < key[n_node]:
+                key[n_node] = weights[e]
+                parent[n_node] = curr
+                pq.push_or_decrease(n_node, weights[e])
 
     return mst
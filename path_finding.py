@@ -1,4 +1,8 @@
+import csr_graph
 import heapq
+import indexed_priority_queue
+from array import array
+from collections import deque
 from typing import Callable
 
 
@@ -6,34 +10,40 @@ from typing import Callable
 
 
 # Dijkstra's Shortest Path
-def dijkstra_shortest_path(adj_list: list[list[tuple[int, float]]], start: int, end: int) -> tuple[float, list[int]]:
-    prev = [-1] * len(adj_list)
-    seen = [(False, 0.0)] * len(adj_list)
-    pq = [(0.0, start, -1)]  # Each item is (current_distance, current_node_index, previous_node_index)
+# If a stats dict is given, the number of settled nodes is stored in stats["settled"].
+def dijkstra_shortest_path(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, start: int, end: int,
+                           stats: dict = None) -> tuple[float, list[int]]:
+    edges = csr_graph.edge_lister(adj_list)
+    n = len(adj_list)
+    prev = [-1] * n
+    dist = [float("inf")] * n
+    seen = [False] * n
+    # The indexed heap supports decrease-key, so each node is queued at most once and no stale entries are popped
+    pq = indexed_priority_queue.IndexedPriorityQueue(n)
+    pq.push(start, 0.0)
+    dist[start] = 0.0
+    settled = 0
 
     while True:
-        curr = heapq.heappop(pq)
-        curr_dist = curr[0]
-        curr_index = curr[1]
-        prev_node = curr[2]
-
-        # Since this isn't using a structure like fib heaps that allows for easy modification of an existing item's
-        # priority, it can't update items that are already on the heap and must instead add them again to the heap.
-        # Therefore, this needs to account for duplicate entries for the same node.
-        if seen[curr_index][0]:
-            continue
-
-        seen[curr_index] = (True, curr_dist)
-        prev[curr_index] = prev_node
+        curr_dist, curr_index = pq.pop()
+        seen[curr_index] = True
+        settled += 1
 
         if curr_index == end:
             break
 
-        for n_node in adj_list[curr_index]:
-            if seen[n_node[0]][0]:
+        for n_node, w in edges(curr_index):
+            if seen[n_node]:
                 continue
 
-            heapq.heappush(pq, (n_node[1] + curr_dist, n_node[0], curr_index))
+            n_dist = w + curr_dist
+            if n_dist < dist[n_node]:
+                dist[n_node] = n_dist
+                prev[n_node] = curr_index
+                pq.push_or_decrease(n_node, n_dist)
+
+    if stats is not None:
+        stats["settled"] = settled
 
     path = []
     pos = end
@@ -41,7 +51,7 @@ def dijkstra_shortest_path(adj_list: list[list[tuple[int, float]]], start: int,
         path.append(pos)
         pos = prev[pos]
 
-    return seen[end][1], path[::-1]
+    return dist[end], path[::-1]
 
 
 # Bellman-ford
@@ -54,10 +64,16 @@ def bellman_ford(vertices: list[int], edges: list[(int, int, float)], source: in
     prev[source] = source
 
     for _ in range(len(vertices) - 1):
+        changed = False
         for edge in edges:
             if distance[edge[0]] + edge[2] < distance[edge[1]]:
                 distance[edge[1]] = distance[edge[0]] + edge[2]
                 prev[edge[1]] = edge[0]
+                changed = True
+
+        # A round without any relaxation means every later round would be identical, including the cycle check below
+        if not changed:
+            return distance, prev
 
     for edge in edges:
         if distance[edge[0]] + edge[2] < distance[edge[1]]:
@@ -66,34 +82,121 @@ def bellman_ford(vertices: list[int], edges: list[(int, int, float)], source: in
     return distance, prev
 
 
-# A*
-def a_star(adj_list: list[list[tuple[int, float]]], start: int, end: int, h: Callable[[int], float]) \
-        -> tuple[float, list[int]]:
-    prev = [-1] * len(adj_list)
-    seen = [(False, 0.0)] * len(adj_list)
-    pq = [(0.0, 0.0, start, -1)]  # Each item is (f = d + h, d, current_node_index, previous_node_index)
+# Bellman-ford with NumPy: the edges are kept as source/target/weight arrays and each round relaxes all of them at
+# once with np.minimum.at. Stops as soon as a round changes nothing. Same contract as bellman_ford.
+def bellman_ford_vectorised(vertices: list[int], edges: list[(int, int, float)], source: int) \
+        -> tuple[None, None] | tuple[list[float], list[int]]:
+    import numpy as np  # only this variant needs NumPy
 
-    while True:
-        curr = heapq.heappop(pq)
-        curr_dist = curr[1]
-        curr_index = curr[2]
-        prev_node = curr[3]
+    n = len(vertices)
+    edge_array = np.array(edges, dtype=np.float64).reshape(-1, 3)
+    sources = edge_array[:, 0].astype(np.intp)
+    targets = edge_array[:, 1].astype(np.intp)
+    weights = edge_array[:, 2]
 
-        # Not using a structure like fib heap that allows easy modification of existing item pri; account for duplicates
-        if seen[curr_index][0]:
-            continue
+    distance = np.full(n, np.inf)
+    prev = np.full(n, -1, dtype=np.intp)
+    distance[source] = 0.0
+    prev[source] = source
+
+    for _ in range(n):  # the extra round doubles as the negative cycle check
+        candidate = distance[sources] + weights
+        relaxed = distance.copy()
+        np.minimum.at(relaxed, targets, candidate)
+        improved = relaxed < distance
+        if not improved.any():
+            return distance.tolist(), prev.tolist()
+
+        # Record, for every improved node, one edge that achieved its new distance
+        winning = improved[targets] & (candidate == relaxed[targets])
+        prev[targets[winning]] = sources[winning]
+        distance = relaxed
+
+    return None, None
+
+
+# Queue-based Bellman-ford (SPFA): only nodes whose distance changed are rescanned, which on sparse graphs is far
+# fewer than |V| - 1 full rounds. A path that grows to |V| edges means a negative cycle. Same contract as bellman_ford.
+def bellman_ford_spfa(vertices: list[int], edges: list[(int, int, float)], source: int) \
+        -> tuple[None, None] | tuple[list[float], list[int]]:
+    n = len(vertices)
+    graph = csr_graph.CSRGraph.from_edges(n, edges)
+    distance = array('d', [float("inf")]) * n
+    prev = array('i', [-1]) * n
+    distance[source] = 0.0
+    prev[source] = source
+
+    if not _spfa(graph, distance, prev, [source]):
+        return None, None
+
+    return list(distance), list(prev)
+
+
+# SPFA core: relaxes from the given start nodes until nothing changes. Returns False on a negative cycle.
+def _spfa(graph: csr_graph.CSRGraph, distance: array, prev: array, start_nodes) -> bool:
+    n = len(graph)
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    length = array('i', [0]) * n  # edges on the current path to each node
+    in_queue = bytearray(n)
+    queue = deque(start_nodes)
+    for u in queue:
+        in_queue[u] = 1
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = 0
+        du = distance[u]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if du + weights[e] < distance[v]:
+                distance[v] = du + weights[e]
+                prev[v] = u
+                length[v] = length[u] + 1
+                if length[v] >= n:
+                    return False
+                if not in_queue[v]:
+                    in_queue[v] = 1
+                    queue.append(v)
+
+    return True
 
-        seen[curr_index] = (True, curr_dist)
-        prev[curr_index] = prev_node
+
+# A*
+def a_star(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, start: int, end: int,
+           h: Callable[[int], float], stats: dict = None) -> tuple[float, list[int]]:
+    edges = csr_graph.edge_lister(adj_list)
+    n = len(adj_list)
+    prev = [-1] * n
+    dist = [float("inf")] * n
+    seen = [False] * n
+    pq = indexed_priority_queue.IndexedPriorityQueue(n)  # keyed by f = d + h, lowered in place as d improves
+    pq.push(start, h(start))
+    dist[start] = 0.0
+    settled = 0
+
+    while True:
+        _, curr_index = pq.pop()
+        curr_dist = dist[curr_index]
+        seen[curr_index] = True
+        settled += 1
 
         if curr_index == end:
             break
 
-        for n_node in adj_list[curr_index]:
-            if seen[n_node[0]][0]:
+        for n_node, w in edges(curr_index):
+            if seen[n_node]:
                 continue
 
-            heapq.heappush(pq, (n_node[1] + curr_dist + h(n_node[0]), n_node[1] + curr_dist, n_node[0], curr_index))
+            n_dist = w + curr_dist
+            if n_dist < dist[n_node]:
+                dist[n_node] = n_dist
+                prev[n_node] = curr_index
+                pq.push_or_decrease(n_node, n_dist + h(n_node))
+
+    if stats is not None:
+        stats["settled"] = settled
 
     path = []
     pos = end
@@ -101,46 +204,182 @@ def a_star(adj_list: list[list[tuple[int, float]]], start: int, end: int, h: Cal
         path.append(pos)
         pos = prev[pos]
 
-    return seen[end][1], path[::-1]
+    return dist[end], path[::-1]
+
+
+# Bidirectional Dijkstra - searches forward from start over the graph and backward from end over its transpose, and
+# stops once the two smallest queue keys add up to at least the best meeting-point distance found so far. The
+# transpose is cached on the CSRGraph, so for repeated queries convert an adjacency list to a CSRGraph once and pass
+# that; a list is converted, transpose included, on every call. Returns (inf, []) if end is unreachable.
+def bidirectional_dijkstra(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, start: int, end: int,
+                           stats: dict = None) -> tuple[float, list[int]]:
+    return _bidirectional_search(csr_graph.as_csr(adj_list), start, end, None, stats)
+
+
+# Bidirectional A* with the average potential p(v) = (h(v) - h_reverse(v)) / 2 for the forward search and -p(v) for
+# the backward one, which keeps both searches consistent so the Dijkstra stopping rule still holds. h estimates the
+# distance from v to end and h_reverse the distance from start to v; without h_reverse, h alone is still admissible
+# as p(v) = h(v) / 2.
+def bidirectional_a_star(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph, start: int, end: int,
+                         h: Callable[[int], float], h_reverse: Callable[[int], float] = None, stats: dict = None) \
+        -> tuple[float, list[int]]:
+    if h_reverse is None:
+        def potential(v: int) -> float:
+            return h(v) / 2
+    else:
+        def potential(v: int) -> float:
+            return (h(v) - h_reverse(v)) / 2
+
+    return _bidirectional_search(csr_graph.as_csr(adj_list), start, end, potential, stats)
+
+
+def _bidirectional_search(graph: csr_graph.CSRGraph, start: int, end: int,
+                          potential: None | Callable[[int], float], stats: None | dict) -> tuple[float, list[int]]:
+    if start == end:
+        if stats is not None:
+            stats["settled"] = 1
+        return 0.0, [start]
+
+    n = len(graph)
+    reverse = graph.transpose()
+    inf = float("inf")
+    # Index 0 is the forward search from start, index 1 the backward search from end
+    graphs = (graph, reverse)
+    dist = ([inf] * n, [inf] * n)
+    prev = ([-1] * n, [-1] * n)
+    settled = ([False] * n, [False] * n)
+    sign = (1.0, -1.0)  # the backward search uses the negated potential
+
+    dist[0][start] = 0.0
+    dist[1][end] = 0.0
+    pqs = ([(potential(start) if potential else 0.0, start)], [(-potential(end) if potential else 0.0, end)])
+    best = inf
+    meet = -1
+    settled_count = 0
+
+    while pqs[0] and pqs[1]:
+        # With the potentials folded into both keys, the stopping rule is the same as for plain bidirectional Dijkstra
+        if pqs[0][0][0] + pqs[1][0][0] >= best:
+            break
+
+        side = 0 if len(pqs[0]) <= len(pqs[1]) else 1
+        pq = pqs[side]
+        _, curr_index = heapq.heappop(pq)
+        if settled[side][curr_index]:
+            continue
+        settled[side][curr_index] = True
+        settled_count += 1
+
+        side_dist = dist[side]
+        other_dist = dist[1 - side]
+        side_prev = prev[side]
+        offsets = graphs[side].offsets
+        targets = graphs[side].targets
+        weights = graphs[side].weights
+        curr_dist = side_dist[curr_index]
+
+        for e in range(offsets[curr_index], offsets[curr_index + 1]):
+            n_node = targets[e]
+            n_dist = curr_dist + weights[e]
+            if n_dist < side_dist[n_node]:
+                side_dist[n_node] = n_dist
+                side_prev[n_node] = curr_index
+                key = n_dist + sign[side] * potential(n_node) if potential else n_dist
+                heapq.heappush(pq, (key, n_node))
+
+                if n_dist + other_dist[n_node] < best:
+                    best = n_dist + other_dist[n_node]
+                    meet = n_node
+
+    if stats is not None:
+        stats["settled"] = settled_count
+
+    if meet == -1:
+        return inf, []
+
+    path = []
+    pos = meet
+    while pos != -1:
+        path.append(pos)
+        pos = prev[0][pos]
+    path.reverse()
+
+    pos = prev[1][meet]
+    while pos != -1:
+        path.append(pos)
+        pos = prev[1][pos]
+
+    return best, path
 
 
 # Johnson's all shortest-paths
-def johnson_all_path(adj_list: list[list[tuple[int, float]]]) -> None | list[list[(float, list[int])]]:
-    n = len(adj_list)
-    vertices = [i for i in range(n + 1)]  # last element is new node q indexed at n
-    edges = [(n, i, 0.0) for i in range(n)]
-    for i, l in enumerate(adj_list):
-        for item in l:
-            edges.append((i, item[0], item[1]))
+def johnson_all_path(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph) \
+        -> None | list[list[(float, list[int])]]:
+    graph = csr_graph.as_csr(adj_list)
+    n = len(graph)
 
-    bf_dist, _ = bellman_ford(vertices, edges, n)
-    if bf_dist is None:
+    reweighing = johnson_reweigh(graph)
+    if reweighing is None:
         return None
+    bf_dist, reweighed = reweighing
 
-    reweighed = [[] for _ in range(n)]
-    for i, l in enumerate(adj_list):
-        for item in l:
-            reweighed[i].append((item[0], item[1] + bf_dist[i] - bf_dist[item[0]]))
-
+    # One search per source settles every target for that source instead of one search per (i, j) pair
+    engine = ShortestPathEngine(reweighed)
     results = [[(0.0, []) for _ in range(n)] for _ in range(n)]
     for i in range(n):
+        paths = engine.query_many([(i, j) for j in range(n) if j != i])
         for j in range(n):
             if i == j:
                 continue
 
-            p = dijkstra_shortest_path(reweighed, i, j)
+            p = paths[j if j < i else j - 1]
             results[i][j] = (p[0] + bf_dist[j] - bf_dist[i], p[1])
     return results
 
 
+# Johnson's reweighing step: returns the potentials h and the graph with non-negative weights w(u, v) + h(u) - h(v),
+# or None if the graph has a negative cycle. A path's true length is its reweighed length - h(start) + h(end).
+def johnson_reweigh(graph: csr_graph.CSRGraph) -> None | tuple[array, csr_graph.CSRGraph]:
+    offsets = graph.offsets
+    targets = graph.targets
+
+    bf_dist = _johnson_potentials(graph)
+    if bf_dist is None:
+        return None
+
+    # Only the weights change, so the reweighed graph shares the offsets/targets arrays of the original one
+    reweighed_weights = array('d', graph.weights)
+    for i in range(len(graph)):
+        for e in range(offsets[i], offsets[i + 1]):
+            reweighed_weights[e] += bf_dist[i] - bf_dist[targets[e]]
+    return bf_dist, graph.with_weights(reweighed_weights)
+
+
+# Bellman-Ford from Johnson's extra node q directly over the CSR arrays. Since q has a 0-weight edge to every node,
+# every distance starts at 0 and q itself never needs to be materialised as a vertex or as edges; the SPFA queue is
+# simply seeded with every node.
+def _johnson_potentials(graph: csr_graph.CSRGraph) -> None | array:
+    n = len(graph)
+    distance = array('d', [0.0]) * n
+    prev = array('i', [-1]) * n
+    if not _spfa(graph, distance, prev, range(n)):
+        return None
+
+    return distance
+
+
 # Floyd-Warshall all shortest-paths
-def floyd_warshall(adj_list: list[list[tuple[int, float]]]) -> None | list[list[(float, int)]]:
-    n = len(adj_list)
+def floyd_warshall(adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph) -> None | list[list[(float, int)]]:
+    graph = csr_graph.as_csr(adj_list)
+    n = len(graph)
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
     d = [[float("inf") if i != j else 0 for j in range(n)] for i in range(n)]
     prev = [[i for _ in range(n)] for i in range(n)]
-    for i, l in enumerate(adj_list):
-        for item in l:
-            d[i][item[0]] = item[1]
+    for i in range(n):
+        for e in range(offsets[i], offsets[i + 1]):
+            d[i][targets[e]] = weights[e]
     for k in range(n):
         for i in range(n):
             for j in range(n):
@@ -152,3 +391,111 @@ def floyd_warshall(adj_list: list[list[tuple[int, float]]]) -> None | list[list[
                     return None
 
     return [[(d[i][j], prev[i][j]) for j in range(n)] for i in range(n)]
+
+
+"""
+ShortestPathEngine - answers batches of (source, target) Dijkstra queries against one graph. Queries are grouped by
+source so that a single search settles every target of that source, and the distance/predecessor arrays are allocated
+once per engine. Instead of clearing them between searches, each search bumps a generation counter and an entry only
+counts as written if its stamp matches the current generation.
+
+Unreachable targets are reported as (inf, []).
+"""
+
+
+class ShortestPathEngine:
+    def __init__(self, adj_list: list[list[tuple[int, float]]] | csr_graph.CSRGraph):
+        self.graph = csr_graph.as_csr(adj_list)
+        n = len(self.graph)
+        self._dist = array('d', [0.0]) * n
+        self._prev = array('i', [-1]) * n
+        self._reached = array('i', [0]) * n  # generation in which dist/prev were last written
+        self._settled = array('i', [0]) * n  # generation in which the node was popped with its final distance
+        self._generation = 0
+
+    def query(self, start: int, end: int) -> tuple[float, list[int]]:
+        return self.query_many([(start, end)])[0]
+
+    def query_many(self, queries: list[tuple[int, int]]) -> list[tuple[float, list[int]]]:
+        by_source = {}
+        for i, query in enumerate(queries):
+            by_source.setdefault(query[0], []).append(i)
+
+        results = [(float("inf"), [])] * len(queries)
+        for source, indices in by_source.items():
+            self._search(source, {queries[i][1] for i in indices})
+            for i in indices:
+                results[i] = self._extract(queries[i][1])
+        return results
+
+    # Full single-source search; returns fresh distance (inf if unreachable) and predecessor (-1 if none) arrays
+    def single_source(self, source: int) -> tuple[array, array]:
+        self._search(source, None)
+        n = len(self.graph)
+        generation = self._generation
+        dist = array('d', [float("inf")]) * n
+        prev = array('i', [-1]) * n
+        for v in range(n):
+            if self._settled[v] == generation:
+                dist[v] = self._dist[v]
+                prev[v] = self._prev[v]
+        return dist, prev
+
+    # Dijkstra from source that stops as soon as every node in targets has been settled (never, if targets is None)
+    def _search(self, source: int, targets: None | set):
+        self._next_generation()
+        generation = self._generation
+        offsets = self.graph.offsets
+        n_targets = self.graph.targets
+        weights = self.graph.weights
+        dist = self._dist
+        prev = self._prev
+        reached = self._reached
+        settled = self._settled
+
+        remaining = len(targets) if targets is not None else -1
+        dist[source] = 0.0
+        prev[source] = -1
+        reached[source] = generation
+        pq = [(0.0, source)]
+
+        while pq:
+            curr_dist, curr_index = heapq.heappop(pq)
+            # Stale duplicate; the node was already settled through a shorter entry
+            if settled[curr_index] == generation:
+                continue
+            settled[curr_index] = generation
+
+            if targets is not None and curr_index in targets:
+                remaining -= 1
+                if remaining == 0:
+                    return
+
+            for e in range(offsets[curr_index], offsets[curr_index + 1]):
+                n_node = n_targets[e]
+                n_dist = curr_dist + weights[e]
+                if reached[n_node] != generation or n_dist < dist[n_node]:
+                    dist[n_node] = n_dist
+                    prev[n_node] = curr_index
+                    reached[n_node] = generation
+                    heapq.heappush(pq, (n_dist, n_node))
+
+    def _extract(self, end: int) -> tuple[float, list[int]]:
+        if self._settled[end] != self._generation:
+            return float("inf"), []
+
+        path = []
+        pos = end
+        while pos != -1:
+            path.append(pos)
+            pos = self._prev[pos]
+
+        return self._dist[end], path[::-1]
+
+    def _next_generation(self):
+        # Stamps are int32; on overflow reset the arrays once and start counting again
+        if self._generation == 2 ** 31 - 1:
+            self._reached = array('i', [0]) * len(self._reached)
+            self._settled = array('i', [0]) * len(self._settled)
+            self._generation = 0
+        self._generation += 1
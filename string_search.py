@@ -27,3 +27,78 @@ def _build_prefix_table(s: str) -> list[int]:
             backtrack += 1
         p[i] = backtrack
     return p
+
+
+"""
+StreamingMatcher - Knuth-Morris-Pratt over input that arrives in chunks. The matcher keeps the KMP state (the length
+of the pattern prefix matched so far) and the absolute offset between feed() calls, so matches spanning a chunk
+boundary are found and reported at their absolute start offset. Overlapping matches are reported, as in
+string_search.
+
+Works on str, bytes, bytearray, mmap and memoryview chunks without decoding, as long as chunk and pattern elements
+compare equal (i.e. a bytes pattern for binary chunks). feed() scans the whole chunk and returns its matches as a
+list, so the state has moved past the chunk when it returns; search() and stream_search() yield lazily chunk by chunk.
+Chunks that support find() (bytes, bytearray, str, mmap) skip ahead to the next occurrence of the first pattern
+element at C speed while no partial match is in progress.
+"""
+
+
+class StreamingMatcher:
+    def __init__(self, pattern):
+        if not pattern:
+            raise ValueError("Pattern must not be empty!")
+        self._pattern = pattern
+        self._first = pattern[:1]
+        self._prefix = _build_prefix_table(pattern)
+        self._backtrack = -1
+        self.offset = 0  # absolute offset of the start of the next chunk
+
+    def reset(self):
+        self._backtrack = -1
+        self.offset = 0
+
+    def feed(self, chunk) -> list[int]:
+        s = self._pattern
+        p = self._prefix
+        last = len(s) - 1
+        backtrack = self._backtrack
+        base = self.offset
+        n = len(chunk)
+        find = getattr(chunk, "find", None)
+        first = self._first
+        matches = []
+
+        i = 0
+        while i < n:
+            if backtrack == -1 and find is not None:
+                i = find(first, i)
+                if i == -1:
+                    break
+
+            c = chunk[i]
+            while backtrack >= 0 and c != s[backtrack + 1]:
+                backtrack = p[backtrack]
+            if c == s[backtrack + 1]:
+                backtrack += 1
+            if backtrack == last:
+                matches.append(base + i - last)
+                backtrack = p[backtrack]
+            i += 1
+
+        self._backtrack = backtrack
+        self.offset = base + n
+        return matches
+
+    def search(self, chunks):
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+
+# Yields the absolute offset of every occurrence of pattern in a binary file object, read chunk_size bytes at a time
+def stream_search(stream, pattern: bytes, chunk_size: int = 1 << 20):
+    matcher = StreamingMatcher(pattern)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield from matcher.feed(chunk)
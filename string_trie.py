@@ -1,21 +1,63 @@
+import bisect
+import heapq
+import itertools
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable
+
 # String Trie
+# Every key carries a score (0 unless given; re-inserting a key without one keeps its score), and every node caches a
+# summary of the best summary_size (score, key) entries in its subtree, best first. insert() merges the new entry into
+# the summaries along its path, stopping at the first node whose summary it does not enter; delete() and score
+# decreases rebuild the summaries along the path from the children's, stopping at the first node whose summary is
+# unchanged. top_k() for k <= summary_size is then a walk to the prefix node plus a slice of its summary.
 class StringTrie:
-    def __init__(self):
+    def __init__(self, summary_size: int = 10):
+        if summary_size < 1:
+            raise ValueError("Summary size must be at least 1!")
         self.root = StringTrie.Node()
+        self.summary_size = summary_size
 
     class Node:
         def __init__(self, parent: 'StringTrie.Node' = None):
             self.parent = parent
             self.children = {}
             self.terminal = False
+            self.score = None
+            self.best = []  # (-score, key) pairs, ascending
 
-    def insert(self, s: str):
+    def insert(self, s: str, score: float = None):
         if not s:
             return
         curr = self.root
         for c in s:
-            curr = curr.children.setdefault(c, StringTrie.Node(parent=curr))
-        curr.terminal = True
+            child = curr.children.get(c)
+            if child is None:
+                child = curr.children[c] = StringTrie.Node(parent=curr)
+            curr = child
+        self._set_score(curr, s, score)
+
+    # insert() for many keys; each key reuses the path of the previous one up to their common prefix, so sorted keys
+    # share most of their traversal. Without scores every key is inserted as by insert(s).
+    def insert_many(self, sorted_keys: Iterable[str], scores: Iterable[float] = None):
+        path = [self.root]  # nodes of prev, path[d] after d characters
+        prev = None
+        scores = iter(scores) if scores is not None else itertools.repeat(None)
+        for s, score in zip(sorted_keys, scores):
+            if not s:
+                continue
+            del path[_common_prefix(prev, s) + 1:]
+            curr = path[-1]
+            for c in s[len(path) - 1:]:
+                child = curr.children.get(c)
+                if child is None:
+                    child = curr.children[c] = StringTrie.Node(parent=curr)
+                curr = child
+                path.append(curr)
+            self._set_score(curr, s, score)
+            prev = s
 
     def find(self, s: str) -> bool:
         curr = self.root
@@ -29,20 +71,461 @@ class StringTrie:
 
         return True
 
+    # find() for many keys; each key continues from the path of the previous one at their common prefix, so sorted
+    # keys share most of their traversal
+    def find_many(self, sorted_keys: Iterable[str]) -> list[bool]:
+        res = []
+        path = [self.root]  # nodes matched for prev, path[d] after d characters
+        prev = None
+        for s in sorted_keys:
+            del path[min(_common_prefix(prev, s), len(path) - 1) + 1:]
+            curr = path[-1]
+            for c in s[len(path) - 1:]:
+                curr = curr.children.get(c)
+                if curr is None:
+                    break
+                path.append(curr)
+            res.append(len(path) == len(s) + 1 and path[-1].terminal)
+            prev = s
+        return res
+
     def delete(self, s: str):
         curr = self.root
         for c in s:
             if c not in curr.children:
                 return
             curr = curr.children[c]
+        if not curr.terminal:
+            return
 
         curr.terminal = False
-        if curr.children:
+        curr.score = None
+        depth = len(s)
+        # Prune the branch that only led to s, stopping at a node that is a key itself or has other children
+        while curr is not self.root and not curr.terminal and not curr.children:
+            depth -= 1
+            curr = curr.parent
+            del curr.children[s[depth]]
+
+        self._resummarise(curr, s, depth)
+
+    # Keys starting with prefix, lazily and in sorted order
+    def iter_prefix(self, prefix: str):
+        node = self._node(prefix)
+        if node is not None:
+            yield from _sorted_keys(node, list(prefix))
+
+    # The k best-scored keys starting with prefix as (key, score), best first; ties are broken by key
+    def top_k(self, prefix: str, k: int) -> list[tuple[str, float]]:
+        node = self._node(prefix)
+        if node is None or k <= 0:
+            return []
+        if k <= self.summary_size:
+            return [(key, -neg_score) for neg_score, key in node.best[:k]]
+
+        # Best-first search: the head of a node's summary is the best entry anywhere in its subtree
+        res = []
+        heap = [(node.best[0], 0, node, prefix)] if node.best else []
+        counter = 1
+        while heap and len(res) < k:
+            entry, _, item, key = heapq.heappop(heap)
+            if item is None:
+                res.append((key, -entry[0]))
+                continue
+            if item.terminal:
+                heapq.heappush(heap, ((-item.score, key), counter, None, key))
+                counter += 1
+            for c, child in item.children.items():
+                child_key = key + c if isinstance(c, str) else key + bytes((c,))
+                heapq.heappush(heap, (child.best[0], counter, child, child_key))
+                counter += 1
+        return res
+
+    def _node(self, prefix: str):
+        curr = self.root
+        for c in prefix:
+            curr = curr.children.get(c)
+            if curr is None:
+                return None
+        return curr
+
+    # score None keeps the score of an existing key and gives a new one 0
+    def _set_score(self, node: 'StringTrie.Node', s: str, score: float | None):
+        old = node.score if node.terminal else None
+        if score is None:
+            score = 0.0 if old is None else old
+        if old == score:
+            return
+        node.terminal = True
+        node.score = score
+        if old is not None and score < old:
+            self._resummarise(node, s, len(s))
             return
-        curr = curr.parent
 
-        for c in reversed(s):
-            del curr.children[c]
-            if curr.children:
+        entry = (-score, s)
+        old_entry = (-old, s) if old is not None else None
+        m = self.summary_size
+        while node is not None:
+            best = node.best
+            i = bisect.bisect_left(best, old_entry) if old_entry is not None else len(best)
+            had_old = i < len(best) and best[i] == old_entry
+            if not had_old and len(best) >= m and not entry < best[-1]:
+                # Not in this summary, so not in any summary further up either
                 return
-            curr = curr.parent
+            if had_old:
+                del best[i]
+            bisect.insort(best, entry)
+            del best[m:]
+            node = node.parent
+
+    # Rebuilds the summaries from node (reached by s[:depth]) up to the root
+    def _resummarise(self, node: 'StringTrie.Node', s: str, depth: int):
+        m = self.summary_size
+        while node is not None:
+            own = [(-node.score, s[:depth])] if node.terminal else []
+            best = heapq.nsmallest(m, itertools.chain(own, *(child.best for child in node.children.values())))
+            if best == node.best:
+                return
+            node.best = best
+            node = node.parent
+            depth -= 1
+
+
+"""
+AhoCorasick - StringTrie extended into an Aho-Corasick automaton for finding every occurrence of every stored pattern
+in a single pass over the text. compile() walks the trie breadth-first to add failure links (longest proper suffix
+that is also a trie prefix) and output links (nearest terminal state along the failure chain), then flattens the
+automaton: states are numbered in BFS order, characters are mapped to dense column ids, and the full goto function
+(failure transitions already resolved) is stored as one flat array('i') of states x alphabet. Searching is then one
+table lookup per character.
+
+insert()/delete() invalidate the compiled automaton; it is rebuilt on the next search.
+"""
+
+
+class AhoCorasick(StringTrie):
+    def __init__(self, patterns=()):
+        super().__init__()
+        self._compiled = False
+        for pattern in patterns:
+            self.insert(pattern)
+
+    def insert(self, s: str, score: float = None):
+        super().insert(s, score)
+        self._compiled = False
+
+    def insert_many(self, sorted_keys: Iterable[str], scores: Iterable[float] = None):
+        super().insert_many(sorted_keys, scores)
+        self._compiled = False
+
+    def delete(self, s: str):
+        super().delete(s)
+        self._compiled = False
+
+    def compile(self):
+        # BFS numbering of the trie nodes; patterns are recovered for terminal nodes only
+        nodes = [self.root]
+        parent_state = [-1]
+        edge_char = [None]
+        alphabet = {}
+        i = 0
+        while i < len(nodes):
+            for c, child in nodes[i].children.items():
+                alphabet.setdefault(c, len(alphabet))
+                nodes.append(child)
+                parent_state.append(i)
+                edge_char.append(c)
+            i += 1
+
+        num_states = len(nodes)
+        sigma = len(alphabet)
+        goto = array('i', [0]) * (num_states * sigma)
+        fail = array('i', [0]) * num_states
+        out = array('i', [-1]) * num_states  # pattern id ending at the state
+        out_link = array('i', [-1]) * num_states
+        patterns = []
+        pattern_lengths = array('i')
+        state_of = {id(node): s for s, node in enumerate(nodes)}
+
+        for s, node in enumerate(nodes):
+            if node.terminal:
+                out[s] = len(patterns)
+                chars = []
+                t = s
+                while t > 0:
+                    chars.append(edge_char[t])
+                    t = parent_state[t]
+                chars.reverse()
+                # Patterns come back as they were inserted: str from characters, bytes from byte values
+                patterns.append(bytes(chars) if isinstance(chars[0], int) else "".join(chars))
+                pattern_lengths.append(len(chars))
+
+        # A failure link always points to a shallower state, so in BFS order its row is complete before it is read
+        for s, node in enumerate(nodes):
+            row = s * sigma
+            f_row = fail[s] * sigma
+            for c, col in alphabet.items():
+                child = node.children.get(c)
+                if child is None:
+                    goto[row + col] = goto[f_row + col] if s else 0
+                    continue
+
+                child_state = state_of[id(child)]
+                goto[row + col] = child_state
+                # The failure of a root child is the root; otherwise follow the parent's failure transition
+                f = goto[f_row + col] if s else 0
+                fail[child_state] = f
+                out_link[child_state] = f if out[f] != -1 else out_link[f]
+
+        self._alphabet = alphabet
+        self._sigma = sigma
+        self._goto = goto
+        self._out = out
+        self._out_link = out_link
+        self._patterns = patterns
+        self._pattern_lengths = pattern_lengths
+        self._compiled = True
+
+    # Every occurrence of every pattern in text as (start offset, pattern), ordered by end offset
+    def search(self, text) -> list[tuple[int, str]]:
+        return self.matcher().feed(text)
+
+    # Stateful matcher for chunked input; see AhoCorasickMatcher
+    def matcher(self) -> 'AhoCorasickMatcher':
+        if not self._compiled:
+            self.compile()
+        return AhoCorasickMatcher(self)
+
+
+"""
+AhoCorasickMatcher - keeps the automaton state and absolute offset between feed() calls, so patterns spanning chunk
+boundaries are reported at their absolute start offset. Like string_search.StreamingMatcher, feed() returns the
+chunk's matches as a list with the state already advanced past the chunk, and search() yields lazily chunk by chunk.
+"""
+
+
+class AhoCorasickMatcher:
+    def __init__(self, automaton: AhoCorasick):
+        self._automaton = automaton
+        self._state = 0
+        self.offset = 0
+
+    def feed(self, chunk) -> list[tuple[int, str]]:
+        automaton = self._automaton
+        alphabet = automaton._alphabet
+        sigma = automaton._sigma
+        goto = automaton._goto
+        out = automaton._out
+        out_link = automaton._out_link
+        patterns = automaton._patterns
+        lengths = automaton._pattern_lengths
+        state = self._state
+        base = self.offset
+        matches = []
+
+        for i, c in enumerate(chunk):
+            col = alphabet.get(c, -1)
+            state = goto[state * sigma + col] if col != -1 else 0
+
+            t = state if out[state] != -1 else out_link[state]
+            while t != -1:
+                pattern_id = out[t]
+                matches.append((base + i - lengths[pattern_id] + 1, patterns[pattern_id]))
+                t = out_link[t]
+
+        self._state = state
+        self.offset = base + len(chunk)
+        return matches
+
+    def search(self, chunks):
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+
+"""
+FrozenTrie - read-only, path-compressed (radix) trie over UTF-8 encoded keys, stored in a handful of flat buffers
+instead of one Python object per character:
+
+    label_offsets   array('q')  - the edge label into node v is labels[label_offsets[v]:label_offsets[v + 1]]
+    labels          bytearray   - all edge labels, concatenated
+    child_offsets   array('i')  - the children of node v are children[child_offsets[v]:child_offsets[v + 1]],
+                                  sorted by the first byte of their label
+    children        array('i')
+    terminal        bytearray   - 1 if a key ends at node v
+
+That is 17 bytes per node plus the label bytes, and a radix trie has fewer than two nodes per key. build() takes the
+keys as a sorted iterator and makes a single pass, holding only the path of the previous key in memory: nodes are
+emitted in post-order as soon as the next key diverges from them, so the root is the last node. Keys follow
+StringTrie.insert semantics: empty keys are ignored and duplicates collapse. str keys must be sorted by code point,
+which is also the byte order of their UTF-8 encoding; bytes keys are stored as they are.
+
+save() writes the buffers behind a small header; load() maps the file read-only and wraps it in memoryviews without
+copying, so every process that loads the same file shares one copy of the trie in the page cache.
+"""
+
+_FROZEN_MAGIC = b"FTRI"
+_FROZEN_VERSION = 1
+_FROZEN_HEADER = struct.Struct("<4sBB2xqqq")  # magic, version, little endian flag, pad, nodes, label bytes, keys
+
+
+class FrozenTrie:
+    def __init__(self, label_offsets, labels, child_offsets, children, terminal, num_keys: int):
+        self.label_offsets = label_offsets
+        self.labels = labels
+        self.child_offsets = child_offsets
+        self.children = children
+        self.terminal = terminal
+        self.num_keys = num_keys
+        self.root = len(terminal) - 1
+
+    def __len__(self) -> int:
+        return self.num_keys
+
+    def __contains__(self, s) -> bool:
+        return self.find(s)
+
+    @classmethod
+    def build(cls, sorted_keys: Iterable[str | bytes]) -> 'FrozenTrie':
+        label_offsets = array('q', [0])
+        labels = bytearray()
+        child_offsets = array('i', [0])
+        children = array('i')
+        terminal = bytearray()
+
+        # Each open node on the path of the previous key is [depth, child ids, terminal flag]
+        stack = [[0, [], 0]]
+        prev = b""
+        num_keys = 0
+
+        def close(node, parent_depth):
+            depth, node_children, is_terminal = node
+            labels.extend(prev[parent_depth:depth])
+            label_offsets.append(len(labels))
+            children.extend(node_children)
+            child_offsets.append(len(children))
+            terminal.append(is_terminal)
+            return len(terminal) - 1
+
+        def unwind(depth):
+            # Close every node deeper than depth, splitting the edge that crosses it
+            while stack[-1][0] > depth:
+                node = stack.pop()
+                if stack[-1][0] < depth:
+                    stack.append([depth, [], 0])
+                stack[-1][1].append(close(node, stack[-1][0]))
+
+        for key in sorted_keys:
+            if isinstance(key, str):
+                key = key.encode()
+            if not key or key == prev:
+                continue
+            if key < prev:
+                raise ValueError("Keys must be sorted!")
+
+            common = 0
+            limit = min(len(prev), len(key))
+            while common < limit and prev[common] == key[common]:
+                common += 1
+
+            unwind(common)
+            stack.append([len(key), [], 1])
+            prev = key
+            num_keys += 1
+
+        unwind(0)
+        close(stack.pop(), 0)
+        return cls(label_offsets, labels, child_offsets, children, terminal, num_keys)
+
+    @classmethod
+    def from_trie(cls, trie: StringTrie) -> 'FrozenTrie':
+        return cls.build(_sorted_keys(trie.root, []))
+
+    def find(self, s: str | bytes) -> bool:
+        if isinstance(s, str):
+            s = s.encode()
+        label_offsets = self.label_offsets
+        labels = self.labels
+        child_offsets = self.child_offsets
+        children = self.children
+        node = self.root
+        pos = 0
+        while pos < len(s):
+            # Binary search the children for the one whose label starts with the next byte
+            c = s[pos]
+            lo = child_offsets[node]
+            hi = child_offsets[node + 1]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if labels[label_offsets[children[mid]]] < c:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == child_offsets[node + 1]:
+                return False
+            node = children[lo]
+            start = label_offsets[node]
+            length = label_offsets[node + 1] - start
+            if labels[start] != c or labels[start:start + length] != s[pos:pos + length]:
+                return False
+            pos += length
+
+        return bool(self.terminal[node])
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(_FROZEN_HEADER.pack(_FROZEN_MAGIC, _FROZEN_VERSION, sys.byteorder == "little",
+                                        len(self.terminal), len(self.labels), self.num_keys))
+            for values in (self.label_offsets, self.child_offsets, self.children, self.terminal, self.labels):
+                f.write(values)
+
+    @classmethod
+    def load(cls, path: str) -> 'FrozenTrie':
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mm) < _FROZEN_HEADER.size:
+            raise ValueError("File too small to be a frozen trie!")
+        magic, version, little_endian, n, num_labels, num_keys = _FROZEN_HEADER.unpack_from(mm, 0)
+        if magic != _FROZEN_MAGIC or version != _FROZEN_VERSION:
+            raise ValueError("File is not a frozen trie of a supported version!")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError("Frozen trie file was written with a different byte order!")
+
+        buf = memoryview(mm)
+        pos = _FROZEN_HEADER.size
+        views = []
+        for count, typecode, size in ((n + 1, 'q', 8), (n + 1, 'i', 4), (n - 1, 'i', 4), (n, 'B', 1),
+                                      (num_labels, 'B', 1)):
+            if len(mm) < pos + count * size:
+                raise ValueError("Frozen trie file is truncated!")
+            views.append(buf[pos:pos + count * size].cast(typecode))
+            pos += count * size
+
+        label_offsets, child_offsets, children, terminal, labels = views
+        return cls(label_offsets, labels, child_offsets, children, terminal, num_keys)
+
+
+# Keys in the subtree of node in sorted order, depth-first with children visited by character; path holds the
+# characters leading to node and is extended in place
+def _sorted_keys(node: StringTrie.Node, path: list):
+    stack = [(node, len(path), None)]
+    while stack:
+        node, depth, c = stack.pop()
+        del path[depth:]
+        if c is not None:
+            path.append(c)
+        if node.terminal:
+            yield "".join(path) if isinstance(path[0], str) else bytes(path)
+        stack.extend((node.children[c], len(path), c) for c in sorted(node.children, reverse=True))
+
+
+# Length of the common prefix of a and b
+def _common_prefix(a, b) -> int:
+    if a is None:
+        return 0
+    i = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        i += 1
+    return i
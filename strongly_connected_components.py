@@ -1,70 +1,301 @@
+import csr_graph
+import disjoint_set
+from array import array
+
 # Strongly Connected Components
+# Both algorithms run their depth-first searches on an explicit stack, keeping the position of each node's edge
+# iterator in a flat array, so path length is not limited by the recursion limit and no frame is created per node.
+# They visit nodes and edges in the same order as the recursive formulation.
 
 
 # Kosaraju's algorithm
-def kosaraju_scc(adj_list: list[list[int]]) -> list[int]:
-    n = len(adj_list)
-    visited = [False] * n
-    inorder = []
-    assignments = [-1] * n
-    transpose = [[] for _ in range(n)]
-
-    def traverse(u: int):
-        if visited[u]:
-            return
-        visited[u] = True
-        for node in adj_list[u]:
-            transpose[node].append(u)
-            traverse(node)
-        inorder.append(u)
-
-    def assign_root(u: int, root: int):
-        if assignments[u] != -1:
-            return
-        assignments[u] = root
-        for node in transpose[u]:
-            assign_root(node, root)
+def kosaraju_scc(adj_list: list[list[int]] | csr_graph.CSRGraph) -> list[int]:
+    graph = csr_graph.as_csr(adj_list, weighted=False)
+    n = len(graph)
+    offsets = graph.offsets
+    targets = graph.targets
+    visited = bytearray(n)
+    next_edge = array('i', [0]) * n
+    inorder = array('i')
+    assignments = array('i', [-1]) * n
+    transpose = graph.transpose()
+    t_offsets = transpose.offsets
+    t_targets = transpose.targets
 
     for i in range(n):
-        traverse(i)
+        if visited[i]:
+            continue
+        visited[i] = 1
+        next_edge[i] = offsets[i]
+        stack = [i]
+        while stack:
+            u = stack[-1]
+            e = next_edge[u]
+            if e < offsets[u + 1]:
+                next_edge[u] = e + 1
+                v = targets[e]
+                if not visited[v]:
+                    visited[v] = 1
+                    next_edge[v] = offsets[v]
+                    stack.append(v)
+            else:
+                stack.pop()
+                inorder.append(u)
 
-    for n_node in inorder[::-1]:
-        assign_root(n_node, n_node)
+    for root in reversed(inorder):
+        if assignments[root] != -1:
+            continue
+        assignments[root] = root
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for e in range(t_offsets[u], t_offsets[u + 1]):
+                v = t_targets[e]
+                if assignments[v] == -1:
+                    assignments[v] = root
+                    stack.append(v)
 
-    return assignments
+    return assignments.tolist()
 
 
 # Tarjan's algorithm
-def tarjan_scc(adj_list: list[list[int]]) -> list[int]:
-    n = len(adj_list)
-    index = 0
-    state = [(-1, -1, False) for _ in range(n)]  # index, lowest ancestor, on stack
+def tarjan_scc(adj_list: list[list[int]] | csr_graph.CSRGraph) -> list[int]:
+    popped, bounds, _ = _tarjan(csr_graph.as_csr(adj_list, weighted=False))
+    return [popped[bounds[k]:bounds[k + 1]].tolist() for k in range(len(bounds) - 1)]
+
+
+# Condensation - collapses every strongly connected component into one node. Returns (labels, dag) where labels[v]
+# is the component of node v and dag is the unweighted CSRGraph between components, without duplicate edges.
+# Components are numbered in topological order: every dag edge goes from a lower to a higher component.
+def condensation(adj_list: list[list[int]] | csr_graph.CSRGraph) -> tuple[array, csr_graph.CSRGraph]:
+    graph = csr_graph.as_csr(adj_list, weighted=False)
+    n = len(graph)
+    offsets = graph.offsets
+    targets = graph.targets
+    popped, bounds, completed = _tarjan(graph)
+
+    # Tarjan completes components in reverse topological order, so number them from the back
+    num_components = len(bounds) - 1
+    labels = array('i', [0]) * n
+    for v in range(n):
+        labels[v] = num_components - 1 - completed[v]
+
+    dag_offsets = array('i', [0]) * (num_components + 1)
+    dag_targets = array('i')
+    last_source = array('i', [-1]) * num_components  # dedupes edges to the same component
+    for c in range(num_components):
+        k = num_components - 1 - c
+        for i in range(bounds[k], bounds[k + 1]):
+            u = popped[i]
+            for e in range(offsets[u], offsets[u + 1]):
+                d = labels[targets[e]]
+                if d != c and last_source[d] != c:
+                    last_source[d] = c
+                    dag_targets.append(d)
+        dag_offsets[c + 1] = len(dag_targets)
+
+    return labels, csr_graph.CSRGraph(dag_offsets, dag_targets)
+
+
+"""
+IncrementalSCC - strongly connected components of a graph that only gains edges. Components are tracked in an
+IntDisjointSet (a component is identified by its set's root node), and a topological order of the components is kept
+in the style of Pearce-Kelly. An edge u -> v that agrees with the order changes nothing. One that goes against it
+triggers two bounded searches over the affected region only: forward from v's component through components ordered
+before u's, and backward from u's component through components ordered after v's. If the forward search reaches u,
+the components on both searches form a cycle and are merged; otherwise the affected components are reordered.
+
+component() is a disjoint-set find (amortised inverse-Ackermann, effectively constant) and num_components is a counter.
+"""
+
+
+class IncrementalSCC:
+    def __init__(self, adj_list: list[list[int]] | csr_graph.CSRGraph):
+        graph = csr_graph.as_csr(adj_list, weighted=False)
+        n = len(graph)
+        labels, _ = condensation(graph)
+
+        self._sets = disjoint_set.IntDisjointSet(n)
+        first = array('i', [-1]) * n  # first node seen in each initial component
+        for v in range(n):
+            if first[labels[v]] == -1:
+                first[labels[v]] = v
+            else:
+                self._sets.union(first[labels[v]], v)
+
+        # Position in the topological order, indexed by component root; positions only need to be comparable
+        self._ord = array('i', [0]) * n
+        for v in range(n):
+            self._ord[self._sets.find(v)] = labels[v]
+
+        # Edges between components, stored as the original endpoint nodes and resolved through find() when walked
+        self._out = [set() for _ in range(n)]
+        self._in = [set() for _ in range(n)]
+        for u in range(n):
+            cu = self._sets.find(u)
+            for e in range(graph.offsets[u], graph.offsets[u + 1]):
+                v = graph.targets[e]
+                if self._sets.find(v) != cu:
+                    self._out[cu].add(v)
+                    self._in[self._sets.find(v)].add(u)
+
+    def __len__(self) -> int:
+        return len(self._ord)
+
+    @property
+    def num_components(self) -> int:
+        return self._sets.num_components
+
+    def component(self, v: int) -> int:
+        return self._sets.find(v)
+
+    def same_component(self, u: int, v: int) -> bool:
+        return self._sets.find(u) == self._sets.find(v)
+
+    # Returns the number of components merged away by the batch
+    def add_edges(self, edges) -> int:
+        before = self.num_components
+        for u, v in edges:
+            self.add_edge(u, v)
+        return before - self.num_components
+
+    # Returns True if the edge closed a cycle and merged components
+    def add_edge(self, u: int, v: int) -> bool:
+        find = self._sets.find
+        ord_ = self._ord
+        cu = find(u)
+        cv = find(v)
+        if cu == cv:
+            return False
+
+        self._out[cu].add(v)
+        self._in[cv].add(u)
+        if ord_[cu] < ord_[cv]:
+            return False
+
+        upper = ord_[cu]
+        lower = ord_[cv]
+        forward = self._search(cv, self._out, lambda d: ord_[d] <= upper)
+        backward = self._search(cu, self._in, lambda d: ord_[d] >= lower)
+        pool = sorted(ord_[c] for c in forward | backward)
+
+        if cu not in forward:
+            # No cycle: everything that reaches u moves in front of everything reachable from v
+            ordered = sorted(backward, key=ord_.__getitem__) + sorted(forward, key=ord_.__getitem__)
+            for c, position in zip(ordered, pool):
+                ord_[c] = position
+            return False
+
+        # Cycle: the components both reachable from v and reaching u collapse into one, which sits between the rest
+        cycle = forward & backward
+        before = sorted(backward - cycle, key=ord_.__getitem__)
+        after = sorted(forward - cycle, key=ord_.__getitem__)
+        # The merge frees positions; components before it must only move down and those after it only move up, so
+        # they take the lowest and highest positions of the pool respectively
+        root = self._merge(cycle)
+        for c, position in zip(before + [root], pool):
+            ord_[c] = position
+        for c, position in zip(after, pool[len(pool) - len(after):]):
+            ord_[c] = position
+        return True
+
+    # Components reachable from start (through out or in edges) whose order position satisfies within
+    def _search(self, start: int, edges: list[set], within) -> set:
+        find = self._sets.find
+        found = {start}
+        stack = [start]
+        while stack:
+            c = stack.pop()
+            for x in edges[c]:
+                d = find(x)
+                if d not in found and within(d):
+                    found.add(d)
+                    stack.append(d)
+        return found
+
+    def _merge(self, components: set) -> int:
+        components = list(components)
+        root = components[0]
+        for c in components[1:]:
+            root = self._sets.union(root, c)
+
+        # Pool the edge sets into the largest ones, dropping edges that are now internal to the merged component
+        out_sets = sorted((self._out[c] for c in components), key=len, reverse=True)
+        in_sets = sorted((self._in[c] for c in components), key=len, reverse=True)
+        merged_out = out_sets[0]
+        merged_in = in_sets[0]
+        for edges in out_sets[1:]:
+            merged_out |= edges
+        for edges in in_sets[1:]:
+            merged_in |= edges
+        for c in components:
+            self._out[c] = set()
+            self._in[c] = set()
+
+        find = self._sets.find
+        self._out[root] = {x for x in merged_out if find(x) != root}
+        self._in[root] = {x for x in merged_in if find(x) != root}
+        return root
+
+
+# Iterative Tarjan over flat arrays. Returns the nodes in the order they were popped off the component stack, the
+# boundaries of each component within that order, and the completion index of each node's component.
+def _tarjan(graph: csr_graph.CSRGraph) -> tuple[array, array, array]:
+    n = len(graph)
+    offsets = graph.offsets
+    targets = graph.targets
+    index = array('i', [-1]) * n
+    low = array('i', [0]) * n
+    on_stack = bytearray(n)
+    next_edge = array('i', [0]) * n
+    completed = array('i', [-1]) * n
+    popped = array('i')
+    bounds = array('i', [0])
     st = []
-    scc = []
-
-    def dfs(v: int):
-        nonlocal index
-        state[v] = (index, index, True)
-        index += 1
-        st.append(v)
-
-        for s in adj_list[v]:
-            if state[s][0] == -1:
-                dfs(s)
-                state[v] = (state[v][0], min(state[v][1], state[s][1]), state[v][2])
-            elif state[s][2]:
-                state[v] = (state[v][0], min(state[v][1], state[s][1]), state[v][2])
-
-        if state[v][1] == state[v][0]:
-            new_scc = []
-            curr = -1
-            while curr != v:
-                curr = st.pop()
-                state[curr] = (state[curr][0], state[curr][1], False)
-                new_scc.append(curr)
-            scc.append(new_scc)
+    counter = 0
 
     for i in range(n):
-        if state[i][0] == -1:
-            dfs(i)
-    return scc
+        if index[i] != -1:
+            continue
+
+        index[i] = low[i] = counter
+        counter += 1
+        st.append(i)
+        on_stack[i] = 1
+        next_edge[i] = offsets[i]
+        call_stack = [i]
+
+        while call_stack:
+            v = call_stack[-1]
+            e = next_edge[v]
+            if e < offsets[v + 1]:
+                next_edge[v] = e + 1
+                s = targets[e]
+                if index[s] == -1:
+                    index[s] = low[s] = counter
+                    counter += 1
+                    st.append(s)
+                    on_stack[s] = 1
+                    next_edge[s] = offsets[s]
+                    call_stack.append(s)
+                elif on_stack[s] and low[s] < low[v]:
+                    low[v] = low[s]
+                continue
+
+            # All edges of v are done: "return" to the caller
+            call_stack.pop()
+            if low[v] == index[v]:
+                component = len(bounds) - 1
+                curr = -1
+                while curr != v:
+                    curr = st.pop()
+                    on_stack[curr] = 0
+                    completed[curr] = component
+                    popped.append(curr)
+                bounds.append(len(popped))
+            if call_stack:
+                parent = call_stack[-1]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+
+    return popped, bounds, completed
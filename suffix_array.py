@@ -1,175 +1,209 @@
-from typing import Sequence
-
-
-# Generate suffix array using SA-IS (Suffix Array - Induced Sorting); simple version, memory not optimized
-def suffix_array(s: Sequence) -> list[int]:
-    n = len(s)
-    if n <= 2:
-        indices = sorted([(c, i) for i, c in enumerate(s)])
-        return [i[1] for i in indices]
-
-    sl_array = [True] * n  # False for s, True for l
-    char_count = {}
-
-    # Generate counts of each character which will provide the boundaries and calculate sl mapping
-    for i in range(n-1, -1, -1):
-        char_count[s[i]] = char_count.setdefault(s[i], 0) + 1
-
-        if i == n-1 or s[i] > s[i+1]:
-            sl_array[i] = True
-        elif s[i] < s[i+1]:
-            sl_array[i] = False
-        else:
-            sl_array[i] = sl_array[i+1]
-
-    char_set = sorted([c for c in char_count.keys()])
-    # Needs a sort of the character space to place them in lexicographical order, so technically adds a O(clogc) term
-    char_rank = {c: r for r, c in enumerate(char_set)}
-    num_c = len(char_set)
-    sa = [-1] * n
-
-    # Base case: place the position of the suffix in the SA at the position of its rank in the character set
-    if num_c == n:
-        for i in range(n):
-            sa[char_rank.get(s[i])] = i
-
-        return sa
-
-    # Generate the boundaries of each character bucket
-    position_array = [0] * num_c
-    cnt = 0
-    for i in range(num_c):
-        position_array[i] = cnt
-        cnt += char_count[char_set[i]]
-
-    # Find all LMS: store in a list within a dict with the char as the key
-    char_lms = {}
-    lms_blocks = {}
-    prev_lms = None
-    for i in range(1, n):
-        if sl_array[i-1] and not sl_array[i]:
-            char_lms.setdefault(s[i], []).append(i)
-            if prev_lms is not None:
-                lms_blocks[prev_lms] = i + 1  # Make end boundary exclusive index
-            prev_lms = i
+"""
+Suffix array by SA-IS (Suffix Array - Induced Sorting) in linear time and near-linear memory.
 
-    lms_blocks[prev_lms] = n
+The input is first mapped to a dense integer alphabet without decoding: bytes, bytearray and byte memoryviews are
+read directly as bytes, str with only code points below 256 is encoded to latin-1 (which keeps the order), and
+anything else is mapped through the rank of each distinct element. The sentinel is kept implicit.
 
-    # First pass - place all LMS into the SA
-    _first_pass_fill_lms(char_set=char_set, char_lms=char_lms,
-                         position_array=position_array, char_count=char_count, sa=sa)
+All working state lives in three buffers allocated once and reused by every recursion level:
 
-    # Second pass - induced sort #1
-    _second_pass_forward_induced_sort(s=s, sa=sa, position_array=position_array, char_rank=char_rank, sl_array=sl_array)
+    sa      array('i') of n     - the suffix array being built; a level with n1 LMS suffixes names their substrings
+                                  into sa[n1:], recurses on the reduced string kept in sa[n - n1:] and receives its
+                                  suffix array in sa[:n1] (n1 <= n / 2, so the two never overlap)
+    types   bytearray of n      - S/L type of each position, recomputed from the text after a recursive call
+    buckets array('i')          - bucket heads or tails, recomputed from the text before each pass
 
-    # Third pass - induced sort #2 in reverse
-    _third_pass_reverse_induced_sort(s=s, sa=sa, position_array=position_array, sl_array=sl_array, char_rank=char_rank)
+Recursion levels see their part of sa through memoryview slices, so nothing is copied. LMS substrings are named by
+comparing them in place, character by character, instead of slicing them out.
 
-    # Number the LMS, then recurse
-    reduced_lms = [0] * len(lms_blocks)
-    lms_block_mapping = {}
-    prev_lms_block = None
-    curr_number = 0
-    for i in range(n):
-        if sa[i] in lms_blocks.keys():
-            # Handle the last LMS containing sentinel
-            if lms_blocks[sa[i]] == n:
-                lms_block_mapping[sa[i]] = curr_number
-                curr_number += 1
-                continue
-
-            if prev_lms_block is None:
-                lms_block_mapping[sa[i]] = curr_number
-                prev_lms_block = (sa[i], lms_blocks[sa[i]])
-                continue
-            if s[sa[i]:lms_blocks[sa[i]]] == s[prev_lms_block[0]:prev_lms_block[1]]:
-                lms_block_mapping[sa[i]] = curr_number
-            else:
-                curr_number += 1
-                lms_block_mapping[sa[i]] = curr_number
-                prev_lms_block = (sa[i], lms_blocks[sa[i]])
-
-    recursion_correspondence = {}  # Need to map lms_block -> position in recursion array correspondence
-    j = 0
-    for i in range(n):
-        if i in lms_block_mapping.keys():
-            reduced_lms[j] = lms_block_mapping[i]
-            recursion_correspondence[j] = i
-            j += 1
-
-    sorted_lms_blocks = suffix_array(reduced_lms)
+suffix_array() and lcp_array() return lists as they always have. suffix_array_compact() and lcp_array_compact() return
+the array('i') buffers themselves, at 4 bytes per entry instead of a list slot and an int object, for the indexes built
+on top of them.
+"""
 
-    # Sort the LMS blocks
-    sorted_lms = [0] * len(lms_blocks)
-    for i in range(len(lms_blocks)):
-        sorted_lms[i] = recursion_correspondence.get(sorted_lms_blocks[i])
+from array import array
+from typing import Sequence
 
-    # Final pass
-    sa = [-1] * n
-    char_lms.clear()
-    for lms in sorted_lms:
-        char_lms.setdefault(s[lms], []).append(lms)
 
-    _first_pass_fill_lms(char_set=char_set, char_lms=char_lms,
-                         position_array=position_array, char_count=char_count, sa=sa)
+# Returns the suffix array of s
+def suffix_array(s: Sequence) -> list[int]:
+    return suffix_array_compact(s).tolist()
 
-    _second_pass_forward_induced_sort(s=s, sa=sa, position_array=position_array, char_rank=char_rank, sl_array=sl_array)
 
-    _third_pass_reverse_induced_sort(s=s, sa=sa, position_array=position_array, sl_array=sl_array, char_rank=char_rank)
+# Returns the suffix array of s as array('i')
+def suffix_array_compact(s: Sequence) -> array:
+    text, k = _dense_text(s)
+    n = len(text)
+    sa = array('i', [-1]) * n
+    if n == 0:
+        return sa
 
+    types = bytearray(n)
+    buckets = array('i', [0]) * max(k, n // 2 + 1)
+    _sais(text, memoryview(sa), n, k, types, buckets)
     return sa
 
 
-def _first_pass_fill_lms(char_set: list, char_lms: dict, position_array: list, char_count: dict, sa: list):
-    for i in range(len(char_set)):
-        current_char = char_set[i]
-        current_lms = char_lms.get(current_char, [])
-        end = position_array[i] + char_count[current_char]
-        n_lms = len(current_lms)
+# Returns the text as a sequence of integers in [0, k) that orders like s, and k
+def _dense_text(s: Sequence) -> tuple[Sequence[int], int]:
+    if isinstance(s, (bytes, bytearray)) or _is_byte_view(s):
+        return memoryview(s).cast('B'), 256
+    if isinstance(s, str):
+        if not s or max(s) < '\u0100':
+            return s.encode("latin-1"), 256
+    rank = {c: r for r, c in enumerate(sorted(set(s)))}
+    return array('i', map(rank.__getitem__, s)), len(rank)
 
-        for j in range(n_lms):
-            sa[end - n_lms + j] = current_lms[j]
 
+# Whether s is a contiguous memoryview of unsigned bytes, which can be read as bytes without changing the order.
+# Views of any other format (signed bytes, wider items) are ranked element by element like any other sequence.
+def _is_byte_view(s: Sequence) -> bool:
+    return isinstance(s, memoryview) and s.format in ('B', 'c') and s.c_contiguous
 
-def _second_pass_forward_induced_sort(s: Sequence, sa: list, position_array: list, char_rank: dict, sl_array: list):
-    # Since my implementation keeps the sentinel implicit, needs one explicit step to handle the sentinel at the start
-    first_pass_pos = position_array.copy()  # Copy the original position array so we do not have to regenerate it later
-    pre_sentinel_c = s[-1]
-    sa[first_pass_pos[char_rank[pre_sentinel_c]]] = len(s) - 1
-    first_pass_pos[char_rank[pre_sentinel_c]] += 1
 
-    for i in range(len(s)):
-        if sa[i] == -1:
-            continue
-        prev_ind = sa[i] - 1
-        current_rank = char_rank[s[prev_ind]]
-        if not sl_array[prev_ind]:
-            continue
-        sa[first_pass_pos[current_rank]] = prev_ind
-        first_pass_pos[current_rank] += 1
+def _sais(t: Sequence[int], sa: memoryview, n: int, k: int, types: bytearray, buckets: array):
+    _classify(t, n, types)
 
-
-def _third_pass_reverse_induced_sort(s: Sequence, sa: list, position_array: list, sl_array: list, char_rank: dict):
-    second_pass_pos = position_array.copy()
-    for i in reversed(range(len(s))):
-        prev_ind = sa[i] - 1
-        if sl_array[prev_ind]:
-            continue
-        current_rank = char_rank[s[prev_ind]]
-        # Since we go in reverse and place items at the end of the bucket, we use the position of the
-        # start of the bucket for the character in the next rank subtract one. Don't need to worry about the
-        # character of the last rank since the nature of the SA means the last rank bucket only contains "L" suffixes.
-        sa[second_pass_pos[current_rank+1]-1] = prev_ind
-        second_pass_pos[current_rank + 1] -= 1
-
-
-# Generates a longest common prefix array given a valid suffix array
-def lcp_array(s: Sequence, sa: list[int]):
-    n = len(s)
-    lcp = [0] * (n-1)
-    rank = [0] * n
+    # Stage 1: sort the LMS substrings by placing LMS positions at their bucket tails and inducing
     for i in range(n):
-        rank[sa[i]] = i
+        sa[i] = -1
+    _bucket_bounds(t, n, k, buckets, tails=True)
+    for i in range(1, n):
+        if types[i] and not types[i - 1]:
+            c = t[i]
+            buckets[c] -= 1
+            sa[buckets[c]] = i
+    _induce(t, sa, n, k, types, buckets)
+
+    # Compact the sorted LMS positions into sa[:n1]
+    n1 = 0
+    for i in range(n):
+        p = sa[i]
+        if p > 0 and types[p] and not types[p - 1]:
+            sa[n1] = p
+            n1 += 1
+
+    # Name the LMS substrings by rank; equal substrings share a name. LMS positions are at least two apart, so
+    # position p can keep its name at n1 + p // 2.
+    for i in range(n1, n):
+        sa[i] = -1
+    name = 0
+    prev = -1
+    for i in range(n1):
+        p = sa[i]
+        if prev == -1 or not _lms_substrings_equal(t, n, types, p, prev):
+            name += 1
+            prev = p
+        sa[n1 + p // 2] = name - 1
+    j = n - 1
+    for i in range(n - 1, n1 - 1, -1):
+        if sa[i] >= 0:
+            sa[j] = sa[i]
+            j -= 1
+
+    # Stage 2: sort the LMS suffixes, recursing on the reduced string if the names are not unique
+    reduced = sa[n - n1:n]
+    if name < n1:
+        _sais(reduced, sa[:n1], n1, name, types, buckets)
+        _classify(t, n, types)
+    else:
+        for i in range(n1):
+            sa[reduced[i]] = i
+
+    # Stage 3: map the reduced suffix array back to LMS positions, place them at their bucket tails in sorted order
+    # and induce the full suffix array
+    j = 0
+    for i in range(1, n):
+        if types[i] and not types[i - 1]:
+            reduced[j] = i
+            j += 1
+    for i in range(n1):
+        sa[i] = reduced[sa[i]]
+    for i in range(n1, n):
+        sa[i] = -1
+    _bucket_bounds(t, n, k, buckets, tails=True)
+    for i in range(n1 - 1, -1, -1):
+        p = sa[i]
+        sa[i] = -1
+        c = t[p]
+        buckets[c] -= 1
+        sa[buckets[c]] = p
+    _induce(t, sa, n, k, types, buckets)
+
+
+# types[i] = 1 for S-type positions (suffix smaller than the next one), 0 for L-type; the last position is L-type
+# against the implicit sentinel
+def _classify(t: Sequence[int], n: int, types: bytearray):
+    types[n - 1] = 0
+    for i in range(n - 2, -1, -1):
+        types[i] = t[i] < t[i + 1] or (t[i] == t[i + 1] and types[i + 1])
+
+
+def _bucket_bounds(t: Sequence[int], n: int, k: int, buckets: array, tails: bool):
+    for c in range(k):
+        buckets[c] = 0
+    for i in range(n):
+        buckets[t[i]] += 1
+    total = 0
+    for c in range(k):
+        total += buckets[c]
+        buckets[c] = total if tails else total - buckets[c]
+
+
+def _induce(t: Sequence[int], sa: memoryview, n: int, k: int, types: bytearray, buckets: array):
+    # L-type suffixes, left to right from bucket heads; the implicit sentinel induces the last suffix first
+    _bucket_bounds(t, n, k, buckets, tails=False)
+    c = t[n - 1]
+    sa[buckets[c]] = n - 1
+    buckets[c] += 1
+    for i in range(n):
+        j = sa[i] - 1
+        if j >= 0 and not types[j]:
+            c = t[j]
+            sa[buckets[c]] = j
+            buckets[c] += 1
+
+    # S-type suffixes, right to left from bucket tails
+    _bucket_bounds(t, n, k, buckets, tails=True)
+    for i in range(n - 1, -1, -1):
+        j = sa[i] - 1
+        if j >= 0 and types[j]:
+            c = t[j]
+            buckets[c] -= 1
+            sa[buckets[c]] = j
+
+
+# Compares the LMS substrings starting at a and b (each running to the next LMS position inclusive) in place. The
+# last one runs into the implicit sentinel and is unique.
+def _lms_substrings_equal(t: Sequence[int], n: int, types: bytearray, a: int, b: int) -> bool:
+    d = 0
+    while True:
+        if a + d == n or b + d == n:
+            return False
+        if t[a + d] != t[b + d] or types[a + d] != types[b + d]:
+            return False
+        if d > 0:
+            a_lms = types[a + d] and not types[a + d - 1]
+            b_lms = types[b + d] and not types[b + d - 1]
+            if a_lms or b_lms:
+                return a_lms and b_lms
+        d += 1
+
+
+# Generates a longest common prefix array given a valid suffix array (Kasai): lcp[i] is the length of the common
+# prefix of the suffixes at sa[i] and sa[i + 1]. rank, the inverse of sa, is built if not given.
+def lcp_array(s: Sequence, sa: Sequence[int], rank: Sequence[int] = None) -> list[int]:
+    return lcp_array_compact(s, sa, rank).tolist()
+
+
+# lcp_array() as array('i')
+def lcp_array_compact(s: Sequence, sa: Sequence[int], rank: Sequence[int] = None) -> array:
+    n = len(s)
+    lcp = array('i', [0]) * max(n - 1, 0)
+    if rank is None:
+        rank = array('i', [0]) * n
+        for i in range(n):
+            rank[sa[i]] = i
 
     cnt = 0
     for i in range(n):
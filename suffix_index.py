@@ -0,0 +1,245 @@
+"""
+SuffixIndex - full-text index over one text or a collection of documents, holding the suffix array, its inverse
+(rank) and the Kasai LCP array, all built once.
+
+    count / locate                - binary search for the block of suffixes starting with the pattern, O(m log n).
+                                    Each probe skips the min(lcp with the lower bound, lcp with the upper bound)
+                                    characters already known to match, in the style of Manber-Myers.
+    longest_repeated_substring    - the largest adjacent LCP
+    longest_common_substring      - sliding window over the suffix array covering suffixes of enough distinct
+                                    documents, with the window's minimum LCP kept in a monotonic deque, O(n)
+
+The text is held as integer codes: bytes as they are, str as latin-1 bytes when every code point fits, otherwise as
+code points in an array('i'). Documents are concatenated, each followed by a separator code that is unique and
+smaller than every character (characters are shifted up by the number of documents), so no match and no common
+prefix can run from one document into the next. Positions returned by locate() are in the concatenation;
+document(pos) maps one back to (document, offset).
+
+save() writes the arrays behind a small header; load() maps the file read-only and wraps it in memoryviews without
+copying, so loading is instant and processes share one copy through the page cache.
+"""
+
+import bisect
+import mmap
+import struct
+import suffix_array
+import sys
+from array import array
+from collections import deque
+from typing import Sequence
+
+_MAGIC = b"SIDX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBBBqqq")  # magic, version, little endian flag, str flag, code size, n, documents, shift
+
+
+class SuffixIndex:
+    def __init__(self, text: Sequence[int], is_str: bool, shift: int, doc_starts: Sequence[int], sa: Sequence[int],
+                 rank: Sequence[int], lcp: Sequence[int]):
+        self.text = text  # integer codes, see _codes()
+        self.is_str = is_str
+        self.shift = shift
+        self.doc_starts = doc_starts
+        self.sa = sa
+        self.rank = rank
+        self.lcp = lcp
+
+    @classmethod
+    def build(cls, text: str | bytes | memoryview) -> 'SuffixIndex':
+        codes = _codes(text)
+        return cls._from_codes(codes, isinstance(text, str), 0, array('i', [0, len(codes)]))
+
+    @classmethod
+    def from_documents(cls, documents: Sequence[str | bytes]) -> 'SuffixIndex':
+        num_docs = len(documents)
+        is_str = bool(documents) and isinstance(documents[0], str)
+        codes = array('i')
+        doc_starts = array('i')
+        for d, document in enumerate(documents):
+            if isinstance(document, str) != is_str:
+                raise TypeError("Documents must be all str or all bytes!")
+            doc_starts.append(len(codes))
+            codes.extend(code + num_docs for code in _codes(document))
+            codes.append(d)
+        doc_starts.append(len(codes))
+        return cls._from_codes(codes, is_str, num_docs, doc_starts)
+
+    @classmethod
+    def _from_codes(cls, codes: Sequence[int], is_str: bool, shift: int, doc_starts: array) -> 'SuffixIndex':
+        sa = suffix_array.suffix_array_compact(codes)
+        n = len(sa)
+        rank = array('i', [0]) * n
+        for i in range(n):
+            rank[sa[i]] = i
+        return cls(codes, is_str, shift, doc_starts, sa, rank, suffix_array.lcp_array_compact(codes, sa, rank))
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @property
+    def num_documents(self) -> int:
+        return len(self.doc_starts) - 1
+
+    # (document, offset) of a position in the concatenated text
+    def document(self, pos: int) -> tuple[int, int]:
+        d = bisect.bisect_right(self.doc_starts, pos) - 1
+        return d, pos - self.doc_starts[d]
+
+    def count(self, pattern: str | bytes) -> int:
+        lo, hi = self._range(pattern)
+        return hi - lo
+
+    # Start positions of every occurrence of pattern, ascending
+    def locate(self, pattern: str | bytes) -> list[int]:
+        lo, hi = self._range(pattern)
+        return sorted(self.sa[lo:hi])
+
+    def longest_repeated_substring(self) -> str | bytes:
+        best = 0
+        best_pos = 0
+        for i in range(len(self.lcp)):
+            if self.lcp[i] > best:
+                best = self.lcp[i]
+                best_pos = self.sa[i]
+        return self._decode(best_pos, best)
+
+    # Longest substring occurring in at least min_documents documents (default: all of them)
+    def longest_common_substring(self, min_documents: int = None) -> str | bytes:
+        need = self.num_documents if min_documents is None else min_documents
+        if need < 2:
+            raise ValueError("A common substring needs at least 2 documents!")
+
+        sa = self.sa
+        lcp = self.lcp
+        doc_starts = self.doc_starts
+        doc_of = [bisect.bisect_right(doc_starts, sa[i]) - 1 for i in range(len(sa))]
+        in_window = [0] * self.num_documents
+        distinct = 0
+        window_min = deque()  # indices into lcp with increasing values, for the window's minimum
+        best = 0
+        best_pos = 0
+        lo = 0
+        for hi in range(len(sa)):
+            if in_window[doc_of[hi]] == 0:
+                distinct += 1
+            in_window[doc_of[hi]] += 1
+            if hi > lo:
+                while window_min and lcp[window_min[-1]] >= lcp[hi - 1]:
+                    window_min.pop()
+                window_min.append(hi - 1)
+
+            # Shrink from the left while the window still covers enough documents
+            while distinct >= need:
+                if window_min and lcp[window_min[0]] > best:
+                    best = lcp[window_min[0]]
+                    best_pos = sa[hi]
+                d = doc_of[lo]
+                if in_window[d] == 1 and distinct == need:
+                    break
+                in_window[d] -= 1
+                if in_window[d] == 0:
+                    distinct -= 1
+                lo += 1
+                while window_min and window_min[0] < lo:
+                    window_min.popleft()
+
+        return self._decode(best_pos, best)
+
+    # [lo, hi) block of the suffix array whose suffixes start with pattern
+    def _range(self, pattern: str | bytes) -> tuple[int, int]:
+        codes = self._pattern_codes(pattern)
+        if codes is None:
+            return 0, 0
+        return self._bound(codes, upper=False), self._bound(codes, upper=True)
+
+    # First suffix that is >= pattern (upper=False) or that is greater and does not start with it (upper=True)
+    def _bound(self, p: Sequence[int], upper: bool) -> int:
+        text = self.text
+        sa = self.sa
+        n = len(text)
+        m = len(p)
+        lo = 0
+        hi = n
+        lo_lcp = 0  # common prefix of p with the suffix just below lo
+        hi_lcp = 0  # and with the suffix at hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = sa[mid]
+            k = min(lo_lcp, hi_lcp)
+            while k < m and pos + k < n and text[pos + k] == p[k]:
+                k += 1
+            if k == m:
+                go_right = upper
+            else:
+                go_right = pos + k == n or text[pos + k] < p[k]
+            if go_right:
+                lo = mid + 1
+                lo_lcp = k
+            else:
+                hi = mid
+                hi_lcp = k
+        return lo
+
+    # The pattern as text codes, or None if it contains a character the text cannot hold
+    def _pattern_codes(self, pattern: str | bytes) -> Sequence[int] | None:
+        if isinstance(pattern, str) != self.is_str:
+            raise TypeError("Pattern must be of the same type as the text!")
+        if memoryview(self.text).itemsize == 1:
+            try:
+                return pattern.encode("latin-1") if self.is_str else pattern
+            except UnicodeEncodeError:
+                return None
+        shift = self.shift
+        return [(ord(c) if self.is_str else c) + shift for c in pattern]
+
+    def _decode(self, pos: int, length: int) -> str | bytes:
+        codes = [self.text[i] - self.shift for i in range(pos, pos + length)]
+        return "".join(map(chr, codes)) if self.is_str else bytes(codes)
+
+    def save(self, path: str):
+        n = len(self.text)
+        itemsize = memoryview(self.text).itemsize
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == "little", self.is_str, itemsize, n,
+                                 self.num_documents, self.shift))
+            for values in (self.sa, self.rank, self.lcp, self.doc_starts, self.text):
+                f.write(values)
+
+    @classmethod
+    def load(cls, path: str) -> 'SuffixIndex':
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mm) < _HEADER.size:
+            raise ValueError("File too small to be a suffix index!")
+        magic, version, little_endian, is_str, itemsize, n, num_docs, shift = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("File is not a suffix index of a supported version!")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError("Suffix index file was written with a different byte order!")
+
+        buf = memoryview(mm)
+        pos = _HEADER.size
+        views = []
+        for count, typecode, size in ((n, 'i', 4), (n, 'i', 4), (max(n - 1, 0), 'i', 4), (num_docs + 1, 'i', 4),
+                                      (n, 'B' if itemsize == 1 else 'i', itemsize)):
+            if len(mm) < pos + count * size:
+                raise ValueError("Suffix index file is truncated!")
+            views.append(buf[pos:pos + count * size].cast(typecode))
+            pos += count * size
+
+        sa, rank, lcp, doc_starts, text = views
+        return cls(text, bool(is_str), shift, doc_starts, sa, rank, lcp)
+
+
+# Text as integer codes that order like its characters: bytes-like as bytes, latin-1 str as bytes, other str as code
+# points
+def _codes(text: str | bytes | memoryview) -> Sequence[int]:
+    if isinstance(text, str):
+        if not text or max(text) < '\u0100':
+            return text.encode("latin-1")
+        return array('i', map(ord, text))
+    view = memoryview(text)
+    if view.format not in ('B', 'c'):
+        raise TypeError("Text must be str or a bytes-like object of unsigned bytes!")
+    return view.cast('B')